@@ -0,0 +1,253 @@
+"""Benchmark suite: seeded scenarios for every game, update and draw timed apart.
+
+    python bench.py                   # run and compare with bench_baseline.json
+    python bench.py --save            # store the median of SAVE_RUNS runs as the baseline
+    python bench.py --threshold 0.2   # allowed slowdown before failing (default 0.15)
+    python bench.py --only snake      # scenarios whose name starts with this
+
+Every scenario builds its game on a NullBackend, so draw() runs against a
+NullCanvas and measures the game's own drawing code, not Tk. Each number is
+the best of REPEATS runs, in microseconds per call, each run from a freshly
+seeded setup and long enough (the scenario's call count) to be out of timer
+noise; the collector is off while timing. Exits with status 1 when any number is slower
+than its baseline by more than the threshold. A baseline is the median of
+SAVE_RUNS such numbers, so one lucky or unlucky run doesn't set the bar.
+Baselines are per machine: re-save after moving to another one.
+"""
+
+import gc
+import json
+import os
+import random
+import sys
+import time
+
+import block_breaker
+import clash_royal_v5
+import minesweeper
+import snake
+import spaceinvaders
+from gameruntime import NullBackend
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(HERE, "bench_baseline.json")
+REPEATS = 7
+SAVE_RUNS = 5
+THRESHOLD = 0.15
+
+# --- Scenarios: setup(calls) -> (update, draw); draw may be None ---
+def clash_battle(troops):
+    # `troops` troops split between the sides, spread over both halves of the lane
+    def setup(calls):
+        random.seed(0)
+        game = clash_royal_v5.Game(NullBackend())
+        game.bot_delay = float("inf")       # no bot plays: the troop count stays put
+        for i in range(troops):
+            side = "player" if i % 2 else "enemy"
+            x = random.uniform(150, clash_royal_v5.WIDTH / 2 - 20)
+            if side == "enemy":
+                x = clash_royal_v5.WIDTH - x
+            y = random.uniform(clash_royal_v5.LANE_TOP, clash_royal_v5.LANE_BOTTOM)
+            game.troops.append(clash_royal_v5.Troop(x, y, side, random.choice(list(clash_royal_v5.TROOPS))))
+        return (lambda: game.update(game.step)), game.draw
+    return setup
+
+def breakout_field(bricks):
+    # `bricks` 4x3 bricks packed into rows under the HUD
+    def setup(calls):
+        random.seed(0)
+        game = block_breaker.Breakout(NullBackend())
+        per_row = block_breaker.GB_WIDTH // 5
+        game.bricks = [[{"x": 1 + (i % per_row) * 5, "y": 16 + row * 4, "w": 4, "h": 3, "hp": 1}
+                        for i in range(row * per_row, min(bricks, (row + 1) * per_row))]
+                       for row in range((bricks + per_row - 1) // per_row)]
+        return (lambda: game.update(game.step)), game.draw
+    return setup
+
+def minesweeper_flood(size):
+    # reveal one corner of a mine-free size x size board: the flood opens it all
+    def setup(calls):
+        boards = []
+        for _ in range(calls):
+            board = minesweeper.Board(size, size, 0)
+            board.set_mines([0] * size)
+            boards.append(board)
+        view = minesweeper.Minesweeper(NullBackend(), size, size, 0)
+        view.board.set_mines([0] * size)
+        view.board.reveal(0, 0)
+        view.mines_placed = True
+        return (lambda: boards.pop().reveal(0, 0)), view.draw_viewport
+    return setup
+
+def hamiltonian_cycle(cols, rows):
+    # row 0 left to right, a serpentine over columns 1.. for the other rows,
+    # then back up column 0; needs an even number of rows
+    cells = [(x, 0) for x in range(cols)]
+    for y in range(1, rows):
+        xs = range(cols - 1, 0, -1) if y % 2 else range(1, cols)
+        cells += [(x, y) for x in xs]
+    cells += [(0, y) for y in range(rows - 1, 0, -1)]
+    return cells
+
+def snake_length(length, cols=64, rows=64):
+    # a snake of `length` that follows a Hamiltonian cycle, so it never dies;
+    # no food, so it never grows. SnakeGame.tick() does both halves at once,
+    # so update is the engine's step and draw the canvas mirroring of a move.
+    def setup(calls):
+        cycle = hamiltonian_cycle(cols, rows)
+        game = snake.SnakeGame(NullBackend())
+        engine = game.engine = snake.SnakeEngine(cols, rows, seed=0)
+        body = cycle[:length][::-1]
+        engine.cells = snake.deque(body)
+        engine.occupied = set(body)
+        engine.free = snake.FreeCells(cols, rows)
+        for cell in body:
+            engine.free.remove(cell)
+        engine.food = None
+        game.canvas.delete("all")
+        game.items = snake.deque(game.canvas.create_rectangle(snake.cell_rect(c), fill="green") for c in body)
+        names = {d: name for name, d in snake.DIRECTIONS.items()}
+        where = {cell: i for i, cell in enumerate(cycle)}
+
+        def update():
+            x, y = engine.cells[0]
+            nx, ny = cycle[(where[x, y] + 1) % len(cycle)]
+            engine.direction = names[nx - x, ny - y]
+            engine.step()
+        return update, game.mirror_move
+    return setup
+
+def snake_arena(snakes):
+    # arena mode at its default size with `snakes` AI snakes; draw builds the
+    # frame image from the grid every time
+    def setup(calls):
+        game = snake.ArenaGame(NullBackend(), snakes=snakes, seed=0)
+
+        def draw():
+            game.dirty = True
+            game.draw(1.0)
+        return (lambda: game.update(game.step)), draw
+    return setup
+
+def invaders_wave(rows, cols, bullets):
+    # a rows x cols formation with `bullets` in flight, topped up every step:
+    # half the player's, half the invaders'. The player is parked off the
+    # field, so no shot ends the game halfway through a run, and invaders
+    # can't die, so the wave is never cleared and the next one never set up
+    # mid-run: every step times the same wave.
+    def setup(calls):
+        random.seed(0)
+        game = spaceinvaders.SpaceInvaders(NullBackend())
+        game.player.move(-1000, 0)
+        game.canvas.delete("invader")
+        game.spawn_invaders(spaceinvaders.wave_formation(rows, cols))
+        game.formation.kill = lambda r, c: None
+        game.player_pool.cap = game.invader_pool.cap = bullets
+
+        def top_up():
+            while len(game.bullets) < bullets // 2:
+                x = random.randint(20, 580)
+                game.bullets.append(game.player_pool.acquire(x, 540, x + 4, 550))
+            while len(game.invader_bullets) < bullets // 2:
+                x = random.randint(20, 580)
+                game.invader_bullets.append(game.invader_pool.acquire(x, 400, x + 4, 410))
+
+        def update():
+            top_up()
+            game.update(game.step)
+        top_up()
+        return update, lambda: game.draw(0.5)
+    return setup
+
+# (name, setup, calls per run)
+SCENARIOS = [
+    ("clash/troops=20", clash_battle(20), 600),
+    ("clash/troops=100", clash_battle(100), 100),
+    ("breakout/bricks=40", breakout_field(40), 1000),
+    ("breakout/bricks=400", breakout_field(400), 200),
+    ("minesweeper/flood=64", minesweeper_flood(64), 200),
+    ("minesweeper/flood=256", minesweeper_flood(256), 40),
+    ("snake/length=100", snake_length(100), 10000),
+    ("snake/length=2000", snake_length(2000), 10000),
+    ("snake/arena=300", snake_arena(300), 200),
+    ("invaders/wave=60,bullets=16", invaders_wave(5, 12, 16), 1000),
+    ("invaders/wave=1152,bullets=48", invaders_wave(24, 48, 48), 400),
+]
+
+# --- Runner ---
+def time_calls(fn, calls):
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        return (time.perf_counter() - start) / calls * 1e6
+    finally:
+        gc.enable()
+
+def run_scenario(setup, calls, repeats=REPEATS):
+    # best of `repeats` fresh runs, microseconds per call, for update and draw;
+    # draw gets its own setup so it draws the scenario, not whatever the
+    # updates left of it (a finished game draws nothing)
+    best_update = best_draw = float("inf")
+    for _ in range(repeats):
+        update, draw = setup(calls)
+        best_update = min(best_update, time_calls(update, calls))
+        update, draw = setup(calls)
+        if draw:
+            best_draw = min(best_draw, time_calls(draw, calls))
+    return {"update": best_update, "draw": best_draw if best_draw != float("inf") else None}
+
+def main(args):
+    threshold = float(args[args.index("--threshold") + 1]) if "--threshold" in args else THRESHOLD
+    only = args[args.index("--only") + 1] if "--only" in args else ""
+    try:
+        with open(BASELINE, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except OSError:
+        baseline = {}
+    results = {}
+    failed = []
+    print(f"{'scenario':<32} {'update us':>10} {'vs base':>8} {'draw us':>10} {'vs base':>8}")
+    save = "--save" in args
+    chosen = [(name, setup, calls) for name, setup, calls in SCENARIOS if name.startswith(only)]
+    # saving takes SAVE_RUNS passes over all the scenarios, not SAVE_RUNS runs
+    # of one in a row, so a slow spell on the machine hits every scenario a little
+    runs = {name: [] for name, _, _ in chosen}
+    for _ in range(SAVE_RUNS if save else 1):
+        for name, setup, calls in chosen:
+            runs[name].append(run_scenario(setup, calls))
+    for name, _, _ in chosen:
+        result = results[name] = {path: None if runs[name][0][path] is None else
+                                  sorted(run[path] for run in runs[name])[len(runs[name]) // 2]
+                                  for path in ("update", "draw")}
+        cells = []
+        for path in ("update", "draw"):
+            value = result[path]
+            base = baseline.get(name, {}).get(path)
+            if value is None:
+                cells += ["-", ""]
+                continue
+            change = ""
+            if base:
+                ratio = value / base - 1
+                change = f"{ratio:+.0%}"
+                if ratio > threshold:
+                    change += " !"
+                    failed.append(f"{name} {path}")
+            cells += [f"{value:.1f}", change]
+        print(f"{name:<32} {cells[0]:>10} {cells[1]:>8} {cells[2]:>10} {cells[3]:>8}")
+    if save:
+        baseline.update(results)
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+            f.write("\n")
+        print(f"saved {len(results)} scenarios to {BASELINE}")
+        return 0
+    if failed:
+        print(f"{len(failed)} regressions over {threshold:.0%}: " + ", ".join(failed))
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,6 +1,6 @@
-import tkinter as tk
 import random
-import time
+
+from gameruntime import run_tk
 
 # --- Configurable settings ---
 GB_WIDTH = 160    # Game Boy style low resolution width
@@ -38,25 +38,27 @@ def to_screen_rect(x, y, w, h):
 
 # --- Game class ---
 class Breakout:
-    def __init__(self, root):
-        self.root = root
-        root.title("Block Breaker (tkinter)")
+    step = 1 / FPS
+
+    def __init__(self, backend):
+        self.backend = backend
+        backend.title("Block Breaker (tkinter)")
 
-        self.canvas = tk.Canvas(root, width=WINDOW_W, height=WINDOW_H, bg=BG, highlightthickness=0)
+        self.canvas = backend.widget("Canvas", width=WINDOW_W, height=WINDOW_H, bg=BG, highlightthickness=0)
         self.canvas.pack()
-        self.root.resizable(False, False)
-
-        # Bindings
-        root.bind("<Left>", lambda e: self.move_paddle(-1))
-        root.bind("<Right>", lambda e: self.move_paddle(1))
-        root.bind("<KeyRelease-Left>", lambda e: self.move_paddle(0))
-        root.bind("<KeyRelease-Right>", lambda e: self.move_paddle(0))
-        root.bind("<Return>", lambda e: self.try_restart())
+        backend.resizable(False, False)
+
+        # Bindings (queued, handled at the start of the next update)
+        backend.bind("<Left>", "left")
+        backend.bind("<Right>", "right")
+        backend.bind("<KeyRelease-Left>", "stop")
+        backend.bind("<KeyRelease-Right>", "stop")
+        backend.bind("<Return>", "restart")
         # also support 'a' and 'd'
-        root.bind("a", lambda e: self.move_paddle(-1))
-        root.bind("d", lambda e: self.move_paddle(1))
-        root.bind("<KeyRelease-a>", lambda e: self.move_paddle(0))
-        root.bind("<KeyRelease-d>", lambda e: self.move_paddle(0))
+        backend.bind("a", "left")
+        backend.bind("d", "right")
+        backend.bind("<KeyRelease-a>", "stop")
+        backend.bind("<KeyRelease-d>", "stop")
 
         # Game state
         self.running = True
@@ -66,9 +68,6 @@ class Breakout:
         self.high_score = 0
 
         self.reset_game()
-        # Start mainloop timer
-        self._last_time = time.time()
-        self._tick()
 
     def reset_game(self):
         # Initialize or reset state variables
@@ -111,17 +110,22 @@ class Breakout:
         if self.game_over or self.win:
             self.reset_game()
 
-    def _tick(self):
-        # target FPS loop
-        now = time.time()
-        dt = now - self._last_time
-        self._last_time = now
-        if self.running and not self.paused:
-            self.update(dt)
-            self.draw()
-        self.root.after(int(1000 / FPS), self._tick)
+    def handle_inputs(self):
+        for name, event in self.backend.inputs.drain():
+            if name == "left":
+                self.move_paddle(-1)
+            elif name == "right":
+                self.move_paddle(1)
+            elif name == "stop":
+                self.move_paddle(0)
+            elif name == "restart":
+                self.try_restart()
 
     def update(self, dt):
+        self.handle_inputs()
+        if not self.running or self.paused:
+            return
+
         # Move paddle
         if self.paddle_dx != 0:
             new_x = self.paddle_x + self.paddle_dx * int(100 * dt)  # speed tuned by dt
@@ -233,7 +237,13 @@ class Breakout:
             if self.score > self.high_score:
                 self.high_score = self.score
 
-    def draw(self):
+    def counts(self):
+        # (entities, canvas items) for frame telemetry; draw() rebuilds the
+        # whole scene, so the canvas holds only this frame's items
+        bricks = sum(1 for row in self.bricks for b in row if b["hp"] > 0)
+        return bricks + 2, len(self.canvas.find_all())
+
+    def draw(self, alpha=1.0):
         self.canvas.delete("all")
         # Background panel (frame)
         pad = to_screen(6)
@@ -288,7 +298,4 @@ class Breakout:
 
 # --- Run the game ---
 if __name__ == "__main__":
-    root = tk.Tk()
-    game = Breakout(root)
-
-    root.mainloop()
+    run_tk(Breakout)
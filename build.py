@@ -0,0 +1,250 @@
+"""Builds the storefront into site/ from catalog.json.
+
+    python build.py [--catalog catalog.json] [--out site]
+
+Local files (pictures, the stylesheet, the game downloads) are copied under
+content-hashed names like qrcode.3f2a9c01d4.jpg, so they can be cached
+forever: a new version is a new name. Every game downloads as a zip of the
+game, the gameruntime/ package it imports and any extra modules it lists,
+so it runs on its own; games.zip holds them all with the launcher. Text
+files also get a gzip -9 variant next to them (file.gz) for servers that
+can send it. index.html keeps its name and points at the hashed files.
+
+site/manifest.json maps each logical name to its hashed file, sha256, size
+and gzip variant. Rebuilds read it back: sources whose size and mtime are
+unchanged are not even re-read, files whose content hash is unchanged are
+not rewritten, and hashed files the last build wrote that nothing points at
+any more are removed. Nothing else in the output folder is touched.
+
+index.html in the repo root is still the hand-written page, served straight
+from the tree until a deploy step publishes site/ instead.
+"""
+
+import glob
+import gzip
+import hashlib
+import html
+import io
+import json
+import os
+import sys
+import time
+import zipfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HASH_LEN = 10           # hex digits of sha256 in hashed names
+MANIFEST = "manifest.json"
+# compress text only; jpg/png/zip are compressed already
+GZIP_TYPES = {".html", ".css", ".js", ".json", ".py", ".svg", ".txt"}
+ZIP_TIME = (1980, 1, 1, 0, 0, 0)   # fixed zip timestamps, so the bundle hash only follows content
+
+# The page used to pull animate.css from a CDN for one flip animation.
+STYLE = """body {
+  font-family: Arial, sans-serif;
+  background: #00ff00;
+  text-align: center;
+}
+h1, h2, h3 {
+  margin: 10px;
+}
+img {
+  margin: 10px;
+  border-radius: 8px;
+}
+.flip {
+  animation: flip 1s infinite;
+  backface-visibility: visible;
+}
+@keyframes flip {
+  from { transform: perspective(400px) rotateY(-360deg); animation-timing-function: ease-out; }
+  40% { transform: perspective(400px) translateZ(150px) rotateY(-190deg); animation-timing-function: ease-out; }
+  50% { transform: perspective(400px) translateZ(150px) rotateY(-170deg); animation-timing-function: ease-in; }
+  80% { transform: perspective(400px) scale(0.95); animation-timing-function: ease-in; }
+  to { transform: perspective(400px); animation-timing-function: ease-in; }
+}
+"""
+
+# Buy buttons talk to store.py: one click buys one of the item. text/plain
+# bodies keep the request "simple", so the browser sends no CORS preflight.
+BUY_JS = """document.addEventListener("click", async (e) => {
+  const id = e.target.dataset && e.target.dataset.product;
+  if (!id) return;
+  const api = document.body.dataset.storeApi;
+  const post = (path, data) => fetch(api + path, {method: "POST", headers: {"Content-Type": "text/plain"},
+                                                  body: JSON.stringify(data || {})}).then(r => r.json());
+  try {
+    const cart = (await post("/api/carts")).cart;
+    await post(`/api/carts/${cart}/items`, {product: id, qty: 1});
+    const order = await post(`/api/carts/${cart}/checkout`);
+    alert(`Order #${order.order}: ${order.total.toLocaleString()} coid`);
+  } catch (err) {
+    alert("The store is closed right now.");
+  }
+});
+"""
+
+def hashed_name(name, digest):
+    stem, ext = os.path.splitext(os.path.basename(name))
+    return f"{stem}.{digest[:HASH_LEN]}{ext}"
+
+def write_file(path, data):
+    # write then rename, so a server never sees half a file
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+class Builder:
+    def __init__(self, root, out):
+        self.root = root
+        self.out = out
+        os.makedirs(out, exist_ok=True)
+        try:
+            with open(os.path.join(out, MANIFEST), encoding="utf-8") as f:
+                self.old = json.load(f)
+        except (OSError, ValueError):
+            self.old = {}
+        self.manifest = {}      # logical name -> entry
+        self.written = 0
+        self.unchanged = 0
+        self.removed = 0
+
+    def add_file(self, name):
+        # a source file from the repo; trust size + mtime to skip reading it
+        path = os.path.join(self.root, name)
+        st = os.stat(path)
+        old = self.old.get(name)
+        if (old and old["size"] == st.st_size and old.get("mtime_ns") == st.st_mtime_ns
+                and os.path.exists(os.path.join(self.out, old["file"]))):
+            self.manifest[name] = old
+            self.unchanged += 1
+            return old["file"]
+        with open(path, "rb") as f:
+            data = f.read()
+        return self.add_bytes(name, data, mtime_ns=st.st_mtime_ns)
+
+    def add_bytes(self, name, data, hashed=True, mtime_ns=None):
+        digest = hashlib.sha256(data).hexdigest()
+        file = hashed_name(name, digest) if hashed else name
+        dest = os.path.join(self.out, file)
+        old = self.old.get(name)
+        if old and old["sha256"] == digest and old["file"] == file and os.path.exists(dest):
+            entry = dict(old, mtime_ns=mtime_ns)
+            self.unchanged += 1
+        else:
+            entry = {"file": file, "sha256": digest, "size": len(data), "gzip": None,
+                     "immutable": hashed, "mtime_ns": mtime_ns}
+            write_file(dest, data)
+            self.written += 1
+            if os.path.splitext(file)[1] in GZIP_TYPES:
+                packed = gzip.compress(data, 9, mtime=0)
+                if len(packed) < len(data):
+                    write_file(dest + ".gz", packed)
+                    entry["gzip"] = file + ".gz"
+        self.manifest[name] = entry
+        return file
+
+    def add_bundle(self, name, patterns):
+        # one zip of the files matching `patterns`, paths relative to the repo
+        files = sorted({f for p in patterns for f in glob.glob(os.path.join(self.root, p))})
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+            for path in files:
+                info = zipfile.ZipInfo(os.path.relpath(path, self.root).replace(os.sep, "/"), ZIP_TIME)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with open(path, "rb") as f:
+                    z.writestr(info, f.read())
+        return self.add_bytes(name, buf.getvalue())
+
+    def finish(self):
+        # drop what the last build wrote and nothing points at any more, then
+        # write the manifest; only files named in the old manifest are ever
+        # removed, so pointing --out at a folder with other files is safe
+        keep = set()
+        for entry in self.manifest.values():
+            keep.add(entry["file"])
+            if entry["gzip"]:
+                keep.add(entry["gzip"])
+        for entry in self.old.values():
+            for file in (entry["file"], entry["gzip"]):
+                path = os.path.join(self.out, file) if file else None
+                if file and file not in keep and os.path.isfile(path):
+                    os.remove(path)
+                    self.removed += 1
+        if self.manifest != self.old:
+            data = json.dumps(self.manifest, indent=1, sort_keys=True).encode()
+            write_file(os.path.join(self.out, MANIFEST), data)
+
+# --- Page ---
+def esc(text):
+    return html.escape(str(text))
+
+def render_page(catalog, css, js, pictures, games, bundle):
+    out = []
+    add = out.append
+    add("<!DOCTYPE html>")
+    add("<html>")
+    add("<head>")
+    add(f"  <title>{esc(catalog['title'])}</title>")
+    add('  <meta charset="UTF-8">')
+    add(f'  <link rel="stylesheet" href="{esc(css)}">')
+    add(f'  <script src="{esc(js)}" defer></script>')
+    add("</head>")
+    add(f'<body data-store-api="{esc(catalog["store_api"])}">')
+    logo = catalog["logo"]
+    add(f'  <img src="{esc(logo["src"])}" width="{logo["size"]}" height="{logo["size"]}" alt="{esc(logo["alt"])}">')
+    add(f'  <marquee direction="left" style="color: blue;"><h1>{esc(catalog["banner"])}</h1></marquee>')
+    add(f"  <h1>{esc(catalog['headline'])}</h1>")
+    add(f'  <h1 class="flip">{esc(catalog["tagline"])}</h1>')
+    add(f'  <marquee direction="right" style="color:#ff0000;"><h2>{esc(catalog["sale"])}</h2></marquee>')
+    add("  <hr>")
+    for section in catalog["sections"]:
+        size = section["image_size"]
+        add(f"  <h2>{esc(section['title'])}</h2>")
+        for group in section["groups"]:
+            add("  <h3>" + ", ".join(f"{esc(p['name'])}: {p['price']:,} coid" for p in group) + "</h3>")
+            for p in group:
+                add(f'  <img src="{esc(p["image"])}" width="{size}" height="{size}" alt="{esc(p["name"])}" loading="lazy">')
+                add(f'  <button data-product="{esc(p["id"])}">buy</button>')
+        add("  <hr>")
+    for picture, file in pictures:
+        add(f'  <img src="{esc(file)}" width="{picture["size"]}" alt="{esc(picture["alt"])}" loading="lazy">')
+    add(f"  <h3>{esc(catalog['games_heading'])}</h3>")
+    add("  <ul>")
+    for game, name, file in games + [bundle]:
+        add(f'    <li><a href="{esc(file)}" download="{esc(name)}">Download {esc(game["label"])}</a></li>')
+    add("  </ul>")
+    add("</body>")
+    add("</html>")
+    return "\n".join(out) + "\n"
+
+def build(catalog_path, out):
+    start = time.perf_counter()
+    with open(catalog_path, encoding="utf-8") as f:
+        catalog = json.load(f)
+    b = Builder(HERE, out)
+    css = b.add_bytes("store.css", STYLE.encode())
+    js = b.add_bytes("buy.js", BUY_JS.encode())
+    pictures = [(p, b.add_file(p["src"])) for p in catalog["pictures"]]
+    # each game zipped with the runtime it imports, so a single download runs
+    games = []
+    for g in catalog["games"]:
+        name = os.path.splitext(g["file"])[0] + ".zip"
+        files = [g["file"]] + g.get("include", []) + catalog["game_runtime"]
+        games.append((g, name, b.add_bundle(name, files)))
+    bundle = catalog["bundle"]
+    bundle = (bundle, bundle["file"], b.add_bundle(bundle["file"], bundle["include"]))
+    page = render_page(catalog, css, js, pictures, games, bundle)
+    b.add_bytes("index.html", page.encode(), hashed=False)
+    b.finish()
+    print(f"{out}: {b.written} written, {b.unchanged} unchanged, {b.removed} removed "
+          f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return b
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    catalog_path = args[args.index("--catalog") + 1] if "--catalog" in args else os.path.join(HERE, "catalog.json")
+    out = args[args.index("--out") + 1] if "--out" in args else os.path.join(HERE, "site")
+    if os.path.abspath(out) == HERE:
+        sys.exit("build.py: --out would overwrite the repo's own index.html")
+    build(catalog_path, out)
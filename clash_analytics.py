@@ -0,0 +1,290 @@
+"""Columnar match analytics for clash_royal_v5.
+
+    CLASH_ANALYTICS=<dir> python clash_royal_v5.py   # record every match into <dir>
+    python clash_analytics.py <dir>                   # summary of what <dir> holds
+    python clash_analytics.py --bench                 # recording cost per tick
+
+A MatchLog keeps four tables. Each column is stored as its own raw binary file
+(<table>.<column>), holding native machine values as the array module writes them:
+
+    matches  one row per match: id, duration, crowns each side, result, and
+             which rows of ticks are its own (first_tick, ticks)
+    ticks    one row per update: troops per side, elixir both sides, tower HP
+    plays    one row per card played: side, card, where
+    damage   one row per (match, side, card): HP taken off troops and towers;
+             a hit counts only the HP its target had left, for troops, towers
+             and spells alike
+
+Rows are buffered in memory and written out a chunk at a time. The ticks
+table is all float32, so recording a tick is one array.fromlist and writing a
+chunk is a strided slice and a tofile() per column. schema.json next to the columns holds the
+type codes, the byte order and the names that the side, card and result
+codes index. A column reads back with one array.fromfile, or with
+numpy.fromfile and the same type code.
+
+Cost: the budget is 5% of a tick, where a tick is one update plus its draw,
+the whole of a frame's work. Recording takes about 1.2 us per tick (--bench),
+4-5% of a headless update + draw and less against a real Tk frame. It is
+about 15% of update() alone in a near-empty arena, where update is only
+~8 us; most of that is the tick row itself (eleven values into the buffer).
+"""
+
+import json
+import os
+import sys
+import time
+from array import array
+from collections import defaultdict
+
+CHUNK = 4096            # rows buffered per table before they are written
+SIDES = ("player", "enemy")
+RESULTS = ("unfinished", "win", "loss", "draw")     # from the player's side
+TOWERS = ("player_top", "player_bottom", "player_king", "enemy_top", "enemy_bottom", "enemy_king")
+TABLES = {
+    "matches": (("match", "I"), ("duration", "f"), ("crowns_player", "B"),
+                ("crowns_enemy", "B"), ("result", "B"), ("first_tick", "Q"), ("ticks", "I")),
+    "ticks": (("time", "f"), ("troops_player", "f"), ("troops_enemy", "f"), ("elixir", "f"),
+              ("enemy_elixir", "f")) + tuple((name + "_hp", "f") for name in TOWERS),
+    "plays": (("match", "I"), ("time", "f"), ("side", "B"), ("card", "B"), ("x", "f"), ("y", "f")),
+    "damage": (("match", "I"), ("side", "B"), ("card", "B"), ("troops", "f"), ("towers", "f")),
+}
+
+class Table:
+    """One table's columns on disk, with the rows not yet written.
+
+    Rows go into a single array (double, or float when every column is a
+    float), row after row; flush() cuts each column out of it with a strided
+    slice and appends that to the column's file, converted only if the
+    column has another type.
+    """
+
+    def __init__(self, folder, name, columns):
+        self.columns = columns
+        self.paths = [os.path.join(folder, f"{name}.{column}") for column, _ in columns]
+        self.rows = array("f" if all(code == "f" for _, code in columns) else "d")
+        self.limit = CHUNK * len(columns)
+        self.last = self.repair()
+        self.files = [open(path, "ab") for path in self.paths]
+
+    def repair(self):
+        # a crash mid-flush leaves some columns a chunk longer than others:
+        # cut them all to the shortest. Returns the first column's last value,
+        # or -1 when the table is empty.
+        counts = []
+        for path, (_, code) in zip(self.paths, self.columns):
+            try:
+                counts.append(os.path.getsize(path) // array(code).itemsize)
+            except OSError:
+                counts.append(0)
+        rows = min(counts)
+        for path, (_, code), count in zip(self.paths, self.columns, counts):
+            if count > rows:
+                with open(path, "r+b") as f:
+                    f.truncate(rows * array(code).itemsize)
+        self.written = rows
+        if not rows:
+            return -1
+        last = array(self.columns[0][1])
+        with open(self.paths[0], "rb") as f:
+            f.seek((rows - 1) * last.itemsize)
+            last.fromfile(f, 1)
+        return last[0]
+
+    def count(self):
+        # rows so far, written or not
+        return self.written + len(self.rows) // len(self.columns)
+
+    def append(self, row):
+        self.rows.fromlist(row)
+        if len(self.rows) >= self.limit:
+            self.flush()
+
+    def flush(self):
+        n = len(self.columns)
+        for i, ((_, code), f) in enumerate(zip(self.columns, self.files)):
+            column = self.rows[i::n]
+            if code != self.rows.typecode:
+                column = array(code, column if code in "fd" else map(int, column))
+            column.tofile(f)
+            f.flush()
+        self.written += len(self.rows) // n
+        del self.rows[:]
+
+    def close(self):
+        self.flush()
+        for f in self.files:
+            f.close()
+
+class MatchLog:
+    """Where the game reports a match as it happens.
+
+    begin() starts a match and end() closes it. The game calls tick() once
+    per update and play() for every card played. Damage goes into `dealt`,
+    keyed (side, card, hit a tower), with no call per hit: the game sums a
+    unit's hits on the unit itself and adds them in when it falls or the
+    match ends. The totals are written per card when the match ends.
+    """
+
+    def __init__(self, folder, cards):
+        os.makedirs(folder, exist_ok=True)
+        self.schema = {
+            "byteorder": sys.byteorder, "cards": list(cards), "sides": list(SIDES),
+            "results": list(RESULTS),
+            "tables": {name: [[column, code, array(code).itemsize] for column, code in columns]
+                       for name, columns in TABLES.items()},
+        }
+        path = os.path.join(folder, "schema.json")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                if json.load(f) != self.schema:
+                    raise ValueError(f"{folder} holds analytics with another schema")
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.schema, f, indent=1)
+        self.tables = {name: Table(folder, name, columns) for name, columns in TABLES.items()}
+        self.ticks = self.tables["ticks"]
+        self.tick_rows = self.ticks.rows
+        self.card_codes = {card: i for i, card in enumerate(cards)}
+        self.side_codes = {side: i for i, side in enumerate(SIDES)}
+        # the next match id follows the last one any table saw (a crash can
+        # leave plays of a match that never got its matches row)
+        self.match = int(max(self.tables[name].last for name in ("matches", "plays", "damage")))
+        self.start = 0.0
+        self.first_tick = 0
+        self.dealt = defaultdict(float)
+
+    def begin(self, now):
+        self.match += 1
+        self.start = now
+        self.first_tick = self.ticks.count()
+        self.dealt = defaultdict(float)
+
+    def tick(self, now, troops_player, troops_enemy, elixir, enemy_elixir, towers):
+        # towers: the game's six Tower objects, in TOWERS order. HP is logged
+        # as is, so a fallen tower can show a little below zero.
+        a, b, c, d, e, f = towers
+        rows = self.tick_rows
+        # (fromlist takes a list at about half the cost of extend on a tuple)
+        rows.fromlist([now - self.start, troops_player, troops_enemy, elixir, enemy_elixir,
+                       a.hp, b.hp, c.hp, d.hp, e.hp, f.hp])
+        if len(rows) >= self.ticks.limit:
+            self.ticks.flush()
+
+    def play(self, now, side, card, x, y):
+        self.tables["plays"].append([self.match, now - self.start, self.side_codes[side],
+                                     self.card_codes[card], x, y])
+
+    def end(self, now, crowns_player, crowns_enemy, result):
+        totals = {}
+        for (side, card, tower), amount in self.dealt.items():
+            totals.setdefault((side, card), [0.0, 0.0])[tower] += amount
+        damage = self.tables["damage"]
+        for (side, card), (troops, towers) in totals.items():
+            damage.append([self.match, self.side_codes[side], self.card_codes[card], troops, towers])
+        self.tables["matches"].append([self.match, now - self.start, crowns_player, crowns_enemy,
+                                       RESULTS.index(result), self.first_tick,
+                                       self.ticks.count() - self.first_tick])
+        self.dealt = defaultdict(float)
+
+    def close(self):
+        for table in self.tables.values():
+            table.close()
+
+# --- Reading ---
+def load(folder):
+    """(schema, {table: {column: array}}) for everything recorded in `folder`."""
+    with open(os.path.join(folder, "schema.json"), encoding="utf-8") as f:
+        schema = json.load(f)
+    tables = {}
+    for name, columns in schema["tables"].items():
+        tables[name] = {}
+        for column, code, size in columns:
+            values = array(code)
+            path = os.path.join(folder, f"{name}.{column}")
+            with open(path, "rb") as f:
+                values.frombytes(f.read())
+            if schema["byteorder"] != sys.byteorder:
+                values.byteswap()
+            tables[name][column] = values
+        # a log still open may have written one column's chunk but not the next
+        rows = min(len(values) for values in tables[name].values())
+        for values in tables[name].values():
+            del values[rows:]
+    return schema, tables
+
+def summarize(folder):
+    schema, tables = load(folder)
+    matches, ticks = tables["matches"], tables["ticks"]
+    cards, results = schema["cards"], schema["results"]
+    n = len(matches["match"])
+    print(f"{folder}: {n} matches, {len(ticks['time'])} ticks, {len(tables['plays']['match'])} cards played")
+    if not n:
+        return
+    outcome = [0] * len(results)
+    for code in matches["result"]:
+        outcome[code] += 1
+    print("results: " + ", ".join(f"{name} {count}" for name, count in zip(results, outcome)))
+    print(f"average match {sum(matches['duration']) / n:.1f}s, crowns {sum(matches['crowns_player']) / n:.2f}"
+          f" - {sum(matches['crowns_enemy']) / n:.2f}")
+    if ticks["time"]:
+        t = len(ticks["time"])
+        print(f"average troops {sum(ticks['troops_player']) / t:.1f} - {sum(ticks['troops_enemy']) / t:.1f},"
+              f" elixir {sum(ticks['elixir']) / t:.1f} - {sum(ticks['enemy_elixir']) / t:.1f}")
+
+    # per side and card: plays, damage to troops and towers
+    rows = {}
+    for side, card in zip(tables["plays"]["side"], tables["plays"]["card"]):
+        rows.setdefault((side, card), [0, 0.0, 0.0])[0] += 1
+    damage = tables["damage"]
+    for side, card, troops, towers in zip(damage["side"], damage["card"], damage["troops"], damage["towers"]):
+        row = rows.setdefault((side, card), [0, 0.0, 0.0])
+        row[1] += troops
+        row[2] += towers
+    print(f"\n{'side':<7} {'card':<16} {'plays':>6} {'troop dmg':>10} {'tower dmg':>10} {'per play':>9}")
+    for (side, card), (plays, troops, towers) in sorted(rows.items(), key=lambda kv: -kv[1][1] - kv[1][2]):
+        per_play = f"{(troops + towers) / plays:9.0f}" if plays else f"{'-':>9}"
+        print(f"{schema['sides'][side]:<7} {cards[card]:<16} {plays:6d} {troops:10.0f} {towers:10.0f} {per_play}")
+
+# --- Benchmark ---
+def run_benchmark(ticks=60 * 100, repeats=15):
+    # the bot against an idle player, headless, with and without a MatchLog;
+    # same seed, so both runs play the same matches
+    import random
+    import tempfile
+    import clash_royal_v5
+    from gameruntime import NullBackend
+
+    def play(folder, draw):
+        random.seed(0)
+        stats = clash_royal_v5.open_stats(folder) if folder else None
+        game = clash_royal_v5.Game(NullBackend(), stats=stats)
+        start = time.perf_counter()
+        for _ in range(ticks):
+            game.update(game.step)
+            if draw:
+                game.draw()
+            game.try_restart()
+        elapsed = time.perf_counter() - start
+        game.close()
+        return elapsed / ticks * 1e6
+
+    with tempfile.TemporaryDirectory() as folder:
+        runs = 0
+        for draw in (False, True):
+            label = "update + draw" if draw else "update"
+            bare = logged = float("inf")
+            for _ in range(repeats):        # interleaved, best of each
+                bare = min(bare, play(None, draw))
+                runs += 1
+                logged = min(logged, play(os.path.join(folder, str(runs)), draw))
+            print(f"{label:<14} {bare:8.2f} us/tick bare, {logged:8.2f} us/tick logged,"
+                  f" {(logged - bare) / bare:+.1%}")
+        summarize(os.path.join(folder, "1"))
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        run_benchmark()
+    elif len(sys.argv) == 2:
+        summarize(sys.argv[1])
+    else:
+        sys.exit(__doc__)
@@ -10,9 +10,12 @@ Features:
 - Colored turf and deploy borders; deploy area expands when opponent side towers die.
 - Giant only attacks towers.
 - Friendly-fire fixed (troops/towers only attack opponents).
+- Optional match analytics: CLASH_ANALYTICS=<dir> logs every match (clash_analytics.py).
 """
 
-import tkinter as tk, random, time, math
+import random, math, os
+
+from gameruntime import run_tk
 
 # ---- Config ----
 WIDTH, HEIGHT = 960, 640
@@ -39,6 +42,8 @@ SPELLS = {
 
 # Card pool (troops + spells)
 ALL_CARDS = list(TROOPS.keys()) + list(SPELLS.keys())
+# what the analytics log credits damage to: the cards, plus the towers' own shots
+DAMAGE_SOURCES = ALL_CARDS + ["Tower", "King Tower"]
 
 # Towers and scoring
 TOWER_HP = 220
@@ -70,6 +75,8 @@ class Troop:
         self.speed = self.base_speed * (1 if side == "player" else -1)
         self.color = d["color"]
         self.alive = True
+        # HP taken off enemy troops and towers, for the analytics log
+        self.hit_troops = self.hit_towers = 0.0
 
     def rect(self):
         r = 12
@@ -84,14 +91,14 @@ class Tower:
         self.dmg = float(KING_DMG if king else TOWER_DMG)
         self.range = float(KING_RANGE if king else TOWER_RANGE)
         self.alive = True
+        self.name = "King Tower" if king else "Tower"     # as the analytics log names it
+        self.hit_troops = self.hit_towers = 0.0
 
     def rect(self):
         w,h = (28,56) if not self.king else (44,72)
         return (self.x-w/2, self.y-h/2, self.x+w/2, self.y+h/2)
 
 # ---- Utility ----
-def now(): return time.time()
-
 def pick_card_with_cost(cost):
     """Return a random card name with exact cost if possible, else +-1 cost choice."""
     exact = [n for n in ALL_CARDS if get_cost(n) == cost]
@@ -106,20 +113,35 @@ def get_cost(name):
     if name in TROOPS: return TROOPS[name]["cost"]
     return SPELLS[name]["cost"]
 
+def open_stats(folder=None):
+    # the CLASH_ANALYTICS hook: a MatchLog writing into that folder, or None
+    folder = folder or os.environ.get("CLASH_ANALYTICS")
+    if not folder:
+        return None
+    from clash_analytics import MatchLog
+    return MatchLog(folder, DAMAGE_SOURCES)
+
 # ---- Game class ----
 class Game:
-    def __init__(self, root):
-        self.root = root
-        root.title("Clash Royale - Tkinter v5")
-        self.canvas = tk.Canvas(root, width=WIDTH, height=HEIGHT, bg="#4FC3F7")
-        self.canvas.pack()
-        root.resizable(False, False)
-        root.bind("<Return>", lambda e: self.try_restart())
-        self.canvas.bind("<Button-1>", self.on_click)
+    step = 1 / FPS
 
+    def __init__(self, backend, stats=None):
+        self.backend = backend
+        backend.title("Clash Royale - Tkinter v5")
+        self.canvas = backend.widget("Canvas", width=WIDTH, height=HEIGHT, bg="#4FC3F7")
+        self.canvas.pack()
+        backend.resizable(False, False)
+        backend.bind("<Return>", "restart")
+        backend.bind("<Button-1>", "click", widget=self.canvas)
+
+        # game clock: seconds of simulated time, advanced only by update(), so
+        # bot delays, spell effects and elixir pulses all run on game time
+        self.time = 0.0
+        # match analytics (clash_analytics.MatchLog), off unless CLASH_ANALYTICS is set
+        self.stats = stats or open_stats()
+        if self.stats:
+            backend.on_close(self.quit)
         self.reset()
-        self._last = now()
-        self._tick()
 
     def reset(self):
         # world
@@ -145,7 +167,7 @@ class Game:
         self.crowns_enemy = 0
 
         # bot timing & behavior
-        self.last_bot_action = now()
+        self.last_bot_action = self.time
         self.bot_delay = 2.2
 
         # score and game state
@@ -164,6 +186,8 @@ class Game:
         self.towers.append(Tower(WIDTH - 110, LANE_CENTER - off/1.5, "enemy", king=False))
         self.towers.append(Tower(WIDTH - 110, LANE_CENTER + off/1.5, "enemy", king=False))
         self.towers.append(Tower(WIDTH - 60, LANE_CENTER, "enemy", king=True))
+        if self.stats:
+            self.stats.begin(self.time)
 
     # ----- Input -----
     def on_click(self, e):
@@ -182,7 +206,7 @@ class Game:
                     self.selected_card_idx = idx
                 else:
                     # pulse elixir display
-                    self.elixir_last_pulse = now()
+                    self.elixir_last_pulse = self.time
         else:
             # attempt to deploy / cast selected card
             if not self.selected_card:
@@ -190,7 +214,7 @@ class Game:
             name = self.selected_card
             cost = get_cost(name)
             if self.elixir < cost:
-                self.elixir_last_pulse = now()
+                self.elixir_last_pulse = self.time
                 self.selected_card = None; self.selected_card_idx = None
                 return
 
@@ -200,18 +224,22 @@ class Game:
                 if e.x <= deploy_limit and LANE_TOP <= e.y <= LANE_BOTTOM:
                     # spawn troop
                     self.troops.append(Troop(e.x, e.y, "player", name))
+                    if self.stats:
+                        self.stats.play(self.time, "player", name, e.x, e.y)
                     self.elixir -= cost
-                    self.elixir_last_pulse = now()
+                    self.elixir_last_pulse = self.time
                     # replace card in hand with same-cost card if possible
                     self.replace_hand_card(self.selected_card_idx, cost)
                 else:
                     # invalid placement pulse
-                    self.elixir_last_pulse = now()
+                    self.elixir_last_pulse = self.time
             else:
                 # Spell: allowed anywhere
-                self.cast_spell(e.x, e.y, SPELLS[name], caster="player")
+                if self.stats:
+                    self.stats.play(self.time, "player", name, e.x, e.y)
+                self.cast_spell(e.x, e.y, name, caster="player")
                 self.elixir -= cost
-                self.elixir_last_pulse = now()
+                self.elixir_last_pulse = self.time
                 self.replace_hand_card(self.selected_card_idx, cost)
 
             self.selected_card = None
@@ -242,15 +270,21 @@ class Game:
         self.enemy_hand[idx] = random.choice(ALL_CARDS)
 
     # ----- Spells -----
-    def cast_spell(self, x, y, spell, caster="player"):
+    def cast_spell(self, x, y, name, caster="player"):
         """Spell hits any units/towers within radius (friendly or enemy). Creates effect."""
+        spell = SPELLS[name]
+        stats = self.stats
         for t in self.troops:
             if math.hypot(t.x - x, t.y - y) <= spell["radius"]:
+                if stats and t.hp > 0:
+                    stats.dealt[caster, name, False] += min(spell["damage"], t.hp)
                 t.hp -= spell["damage"]
                 if t.hp <= 0:
                     t.alive = False
         for tw in self.towers:
             if math.hypot(tw.x - x, tw.y - y) <= spell["radius"]:
+                if stats and tw.hp > 0:
+                    stats.dealt[caster, name, True] += min(spell["damage"], tw.hp)
                 tw.hp -= spell["damage"]
                 if tw.hp <= 0 and tw.alive:
                     tw.alive = False
@@ -271,7 +305,7 @@ class Game:
         # add effect
         self.effects.append({
             "x": x, "y": y,
-            "start": now(), "dur": 0.40,
+            "start": self.time, "dur": 0.40,
             "max_r": spell["radius"], "color": spell["color"]
         })
 
@@ -295,15 +329,22 @@ class Game:
 
     # ----- Main update -----
     def update(self, dt):
+        for name, event in self.backend.inputs.drain():
+            if name == "click":
+                self.on_click(event)
+            elif name == "restart":
+                self.try_restart()
+        self.time += dt
         if self.game_over or self.win: return
+        stats = self.stats
 
         # elixir regen both sides
         self.elixir = min(ELIXIR_MAX, self.elixir + (ELIXIR_MAX / ELIXIR_RECHARGE_TIME) * dt)
         self.enemy_elixir = min(ELIXIR_MAX, self.enemy_elixir + (ELIXIR_MAX / ELIXIR_RECHARGE_TIME) * dt)
 
         # Enemy bot: attempt to play from its hand occasionally and only if can afford
-        if now() - self.last_bot_action > self.bot_delay:
-            self.last_bot_action = now()
+        if self.time - self.last_bot_action > self.bot_delay:
+            self.last_bot_action = self.time
             # choose from enemy hand any playable cards
             playable = [ (i,c) for i,c in enumerate(self.enemy_hand) if get_cost(c) <= self.enemy_elixir ]
             if playable:
@@ -317,6 +358,8 @@ class Game:
                     spawn_x = random.uniform(e_limit + 40, WIDTH - 140)
                     spawn_y = random.choice([LANE_CENTER - 36, LANE_CENTER + 36])
                     self.troops.append(Troop(spawn_x, spawn_y, "enemy", card))
+                    if stats:
+                        stats.play(self.time, "enemy", card, spawn_x, spawn_y)
                     # replace in hand with same-cost card
                     self.enemy_replace_hand_card(idx, cost)
                 else:
@@ -324,7 +367,9 @@ class Game:
                     # pick a target near center-left
                     tx = random.uniform(80, WIDTH * 0.45)
                     ty = random.uniform(LANE_TOP + 20, LANE_BOTTOM - 20)
-                    self.cast_spell(tx, ty, SPELLS[card], caster="enemy")
+                    if stats:
+                        stats.play(self.time, "enemy", card, tx, ty)
+                    self.cast_spell(tx, ty, card, caster="enemy")
                     self.enemy_replace_hand_card(idx, cost)
             # small randomize bot delay to avoid rigid rhythm
             self.bot_delay = random.uniform(1.8, 3.2)
@@ -343,6 +388,8 @@ class Game:
                         dmin, target = d, tw
                 if target:
                     if dmin <= troop.range:
+                        if stats and target.hp > 0:
+                            troop.hit_towers += min(troop.dmg * dt, target.hp)
                         target.hp -= troop.dmg * dt
                         if target.hp <= 0 and target.alive:
                             target.alive = False
@@ -375,6 +422,11 @@ class Game:
                         dmin, target = d, e
                 if target:
                     if dmin <= troop.range:
+                        if stats and target.hp > 0:
+                            if isinstance(target, Tower):
+                                troop.hit_towers += min(troop.dmg * dt, target.hp)
+                            else:
+                                troop.hit_troops += min(troop.dmg * dt, target.hp)
                         target.hp -= troop.dmg * dt
                         if target.hp <= 0:
                             # marking death
@@ -402,8 +454,11 @@ class Game:
             if troop.x < -40 or troop.x > WIDTH + 40:
                 troop.alive = False
 
-        # tidy lists
-        self.troops = [t for t in self.troops if t.alive]
+        # tidy lists; the fallen hand their damage to the analytics log first
+        alive = [t for t in self.troops if t.alive]
+        if stats and len(alive) < len(self.troops):
+            self.credit([t for t in self.troops if not t.alive])
+        self.troops = alive
         # clean towers list but keep them for crown logic (set alive flag False)
         # towers are kept in list, but alive property used
 
@@ -414,12 +469,14 @@ class Game:
             enemies = [tr for tr in self.troops if tr.alive and tr.side != tw.side]
             for e in enemies:
                 if abs(e.x - tw.x) < tw.range and abs(e.y - tw.y) < 80:
+                    if stats and e.hp > 0:
+                        tw.hit_troops += min(tw.dmg * dt, e.hp)
                     e.hp -= tw.dmg * dt
                     if e.hp <= 0: e.alive = False
                     break
 
         # effects expire
-        self.effects = [fx for fx in self.effects if now() - fx["start"] < fx["dur"]]
+        self.effects = [fx for fx in self.effects if self.time - fx["start"] < fx["dur"]]
 
         # Win/Lose: if king dead -> end. Otherwise match continues (we use crown counts only)
         # If king destroyed, assign crowns already above and end match
@@ -430,8 +487,24 @@ class Game:
         if not player_king_alive:
             self.game_over = True
 
+        if stats:
+            enemy = 0
+            for t in self.troops:
+                if t.side == "enemy":
+                    enemy += 1
+            stats.tick(self.time, len(self.troops) - enemy, enemy, self.elixir, self.enemy_elixir, self.towers)
+            if self.win or self.game_over:
+                result = "draw" if self.win and self.game_over else "win" if self.win else "loss"
+                self.credit(self.troops + self.towers)
+                stats.end(self.time, self.crowns_player, self.crowns_enemy, result)
+
     # ----- DRAW -----
-    def draw(self):
+    def counts(self):
+        # (entities, canvas items) for frame telemetry; the scene is redrawn
+        # from scratch every frame
+        return len(self.troops) + len(self.towers) + len(self.effects), len(self.canvas.find_all())
+
+    def draw(self, alpha=1.0):
         self.canvas.delete("all")
         # background
         self.canvas.create_rectangle(0,0,WIDTH,HEIGHT, fill="#7FC8FF", outline="")
@@ -485,7 +558,7 @@ class Game:
 
         # spell effects
         for fx in self.effects:
-            t = (now() - fx["start"]) / fx["dur"]
+            t = (self.time - fx["start"]) / fx["dur"]
             if t > 1.0: continue
             r = t * fx["max_r"]
             self.canvas.create_oval(fx["x"]-r, fx["y"]-r, fx["x"]+r, fx["y"]+r, outline=fx["color"], width=3)
@@ -527,7 +600,7 @@ class Game:
             self.canvas.create_rectangle(x,y,x+150,y+15, fill="#333")
             self.canvas.create_rectangle(x,y,x+150*frac,y+15, fill="#6A1B9A")
             self.canvas.create_text(x+75, y-10, text=f"{label}: {frac*10:.1f}/10", fill="white", font=("Helvetica",10))
-            if pulse and now()-pulse < 0.25:
+            if pulse and self.time-pulse < 0.25:
                 self.canvas.create_rectangle(x,y,x+150*frac,y+15, outline="#FFFF00", width=2)
         draw_elixir(14, HEIGHT - 150, self.elixir / ELIXIR_MAX, "Player Elixir", self.elixir_last_pulse)
         draw_elixir(WIDTH - 164, 14, self.enemy_elixir / ELIXIR_MAX, "Enemy Elixir", self.enemy_elixir_last_pulse)
@@ -549,21 +622,34 @@ class Game:
             self.canvas.create_text(WIDTH/2, HEIGHT/2 + 16, text=f"Player Crowns: {self.crowns_player}   Enemy Crowns: {self.crowns_enemy}", fill="white", font=("Helvetica", 14))
             self.canvas.create_text(WIDTH/2, HEIGHT/2 + 56, text="Press ENTER to restart", fill="white", font=("Helvetica", 12))
 
-    # ---- loop ----
-    def _tick(self):
-        nowt = now()
-        dt = min(0.05, nowt - self._last)
-        self._last = nowt
-        self.update(dt)
-        self.draw()
-        self.root.after(int(1000 / FPS), self._tick)
+    def credit(self, units):
+        # Move the damage troops and towers have summed up into the analytics
+        # log. Done when they fall and when the match ends, not on every hit.
+        dealt = self.stats.dealt
+        for u in units:
+            if u.hit_troops:
+                dealt[u.side, u.name, False] += u.hit_troops
+            if u.hit_towers:
+                dealt[u.side, u.name, True] += u.hit_towers
+            u.hit_troops = u.hit_towers = 0.0
 
     def try_restart(self):
         if self.win or self.game_over:
             self.reset()
 
+    def close(self):
+        # write out the analytics log; a match still going is logged unfinished
+        if self.stats:
+            if not (self.win or self.game_over):
+                self.credit(self.troops + self.towers)
+                self.stats.end(self.time, self.crowns_player, self.crowns_enemy, "unfinished")
+            self.stats.close()
+            self.stats = None
+
+    def quit(self):
+        self.close()
+        self.backend.quit()
+
 # ---- Run ----
 if __name__ == "__main__":
-    root = tk.Tk()
-    Game(root)
-    root.mainloop()
+    run_tk(Game)
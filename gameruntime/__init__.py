@@ -0,0 +1,18 @@
+"""Shared runtime for the games: clocks, a fixed-timestep scheduler, input
+queues and two backends, Tk and a headless null renderer.
+
+A game is any object with `step` (seconds per update), `update(dt)` and
+`draw(alpha)`. It builds its widgets through the backend it is handed, reads
+input from `backend.inputs` during update(), and backend.run(game) drives it.
+A game holding files or processes also has `close()`, which the backend
+calls when it stops the game. `counts()`, returning (entities, canvas items),
+is optional too and feeds the frame telemetry (see telemetry.py). A game
+with `paced = True` is updated once per frame, each frame scheduled `step`
+after the last; its `step` may change between updates.
+"""
+
+from .clock import Clock, ManualClock
+from .scheduler import FixedStep
+from .inputs import InputQueue
+from .telemetry import Recorder
+from .backends import NullCanvas, NullWidget, NullBackend, TkBackend, run_tk
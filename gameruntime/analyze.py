@@ -0,0 +1,83 @@
+"""Offline analysis of telemetry files (see telemetry.py).
+
+    python -m gameruntime.analyze <file.ftel> [...] [--stall-ms 50]
+
+For each file: a frame-time histogram, update and draw percentiles, and the
+worst stalls (frames slower than --stall-ms) with what the game was doing.
+With several files, a table compares the games.
+"""
+
+import sys
+
+from .telemetry import read
+
+BUCKETS = [4, 8, 12, 17, 20, 25, 33, 50, 100]     # frame-time histogram edges, ms
+
+def percentile(values, q):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+def summarize(name, records, stall_ms):
+    # frame time is the gap to the next frame's start
+    gaps = [(b[0] - a[0]) * 1000 for a, b in zip(records, records[1:])]
+    updates = [r[1] / 1000 for r in records]
+    draws = [r[2] / 1000 for r in records]
+    stalls = [(records[i], gap) for i, gap in enumerate(gaps) if gap > stall_ms]
+    return {"name": name, "frames": len(records), "gaps": gaps, "updates": updates, "draws": draws,
+            "stalls": stalls, "seconds": records[-1][0] - records[0][0] if records else 0,
+            "entities": max((r[4] for r in records), default=0), "items": max((r[5] for r in records), default=0)}
+
+def print_histogram(gaps):
+    counts = [0] * (len(BUCKETS) + 1)
+    for gap in gaps:
+        i = 0
+        while i < len(BUCKETS) and gap >= BUCKETS[i]:
+            i += 1
+        counts[i] += 1
+    total = max(1, len(gaps))
+    edges = [0] + BUCKETS
+    for i, n in enumerate(counts):
+        label = f"{edges[i]:>3}-{BUCKETS[i]:<3} ms" if i < len(BUCKETS) else f"{edges[i]:>3}+    ms"
+        print(f"  {label} {n:7d} {n / total:6.1%} {'#' * round(40 * n / total)}")
+
+def report(paths, stall_ms=50.0, max_stalls=10):
+    rows = []
+    for path in paths:
+        name, records = read(path)
+        s = summarize(name, records, stall_ms)
+        rows.append(s)
+        print(f"{path}: {name}, {s['frames']} frames over {s['seconds']:.1f}s")
+        if not records:
+            continue
+        print_histogram(s["gaps"])
+        print(f"  update ms p50 {percentile(s['updates'], 0.5):.2f}  p95 {percentile(s['updates'], 0.95):.2f}"
+              f"  max {max(s['updates']):.2f}")
+        print(f"  draw   ms p50 {percentile(s['draws'], 0.5):.2f}  p95 {percentile(s['draws'], 0.95):.2f}"
+              f"  max {max(s['draws']):.2f}")
+        print(f"  {len(s['stalls'])} stalls over {stall_ms:.0f} ms")
+        t0 = records[0][0]
+        for (start, update_us, draw_us, steps, entities, items), gap in s["stalls"][:max_stalls]:
+            print(f"    at {start - t0:8.3f}s: {gap:7.1f} ms (update {update_us / 1000:.1f} ms over {steps} steps,"
+                  f" draw {draw_us / 1000:.1f} ms, {entities} entities, {items} items)")
+        print()
+    if len(rows) > 1:
+        print(f"{'game':<20} {'frames':>7} {'fps':>6} {'p50 ms':>7} {'p99 ms':>7} {'upd p95':>8} "
+              f"{'draw p95':>9} {'stalls':>7} {'items':>6}")
+        for s in rows:
+            print(f"{s['name']:<20} {s['frames']:7d} {s['frames'] / max(s['seconds'], 1e-9):6.1f} "
+                  f"{percentile(s['gaps'], 0.5):7.2f} {percentile(s['gaps'], 0.99):7.2f} "
+                  f"{percentile(s['updates'], 0.95):8.2f} {percentile(s['draws'], 0.95):9.2f} "
+                  f"{len(s['stalls']):7d} {s['items']:6d}")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    stall_ms = 50.0
+    if "--stall-ms" in args:
+        i = args.index("--stall-ms")
+        stall_ms = float(args[i + 1])
+        del args[i:i + 2]
+    if not args:
+        sys.exit(__doc__)
+    report(args, stall_ms)
@@ -0,0 +1,269 @@
+import math
+import time
+from collections import deque
+
+from .clock import Clock, ManualClock
+from .inputs import InputQueue
+from .scheduler import FixedStep
+from .telemetry import open_recorder
+
+FRAME_MS = 16   # Tk frame interval
+
+class NullWidget:
+    """Takes any widget call and does nothing; queries come back as 0."""
+
+    def __getattr__(self, name):
+        return self._ignore
+
+    def _ignore(self, *args, **kw):
+        return 0
+
+class NullCanvas(NullWidget):
+    """A canvas that hands out item ids and draws nothing. It reports the
+    size it was created with, so viewport maths works headless too."""
+
+    def __init__(self, width=0, height=0, **options):
+        self.width = int(width)
+        self.height = int(height)
+        self.last = 0
+
+    def _create(self, *args, **kw):
+        self.last += 1
+        return self.last
+
+    create_rectangle = create_oval = create_line = create_text = create_image = create_polygon = _create
+
+    def canvasx(self, x, gridspacing=None):
+        # never scrolled: window and canvas coordinates are the same
+        return x
+
+    canvasy = canvasx
+
+    def find_all(self, *tags):
+        return ()
+
+    find_withtag = find_all
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+class NullBackend:
+    """Headless backend: no window, a ManualClock, and run() steps the game
+    as fast as it can, so games run, benchmark and test without a display."""
+
+    headless = True
+
+    def __init__(self, clock=None):
+        self.clock = clock or ManualClock()
+        self.inputs = InputQueue()
+        self.messages = []
+        self.stopped = False
+
+    def title(self, text):
+        pass
+
+    def resizable(self, width, height):
+        pass
+
+    def widget(self, kind, parent=None, **options):
+        return NullCanvas(**options) if kind == "Canvas" else NullWidget()
+
+    def image(self, width, height):
+        return NullWidget()
+
+    def bind(self, sequence, name=None, widget=None):
+        pass
+
+    def on_close(self, callback):
+        pass
+
+    def message(self, title, text):
+        self.messages.append((title, text))
+
+    def quit(self):
+        self.stopped = True
+
+    def frame_stats(self):
+        return 0.0, 0.0, 0.0
+
+    def run(self, game, steps, draw_every=1, telemetry=None):
+        # `steps` fixed updates, drawing after every `draw_every` of them
+        # (0 skips drawing); stops early if the game calls quit(). With a
+        # telemetry Recorder, each step is recorded as a frame. game.step is
+        # read every time, since a paced game's step can change as it plays.
+        if telemetry:
+            return self.run_recorded(game, steps, draw_every, telemetry)
+        for i in range(steps):
+            if self.stopped:
+                return i
+            step = game.step
+            self.clock.advance(step)
+            game.update(step)
+            if draw_every and (i + 1) % draw_every == 0:
+                game.draw(1.0)
+        return steps
+
+    def run_recorded(self, game, steps, draw_every, telemetry):
+        counts = getattr(game, "counts", None)
+        timer = time.perf_counter
+        for i in range(steps):
+            if self.stopped:
+                return i
+            step = game.step
+            self.clock.advance(step)
+            t0 = timer()
+            game.update(step)
+            t1 = timer()
+            if draw_every and (i + 1) % draw_every == 0:
+                game.draw(1.0)
+            t2 = timer()
+            telemetry.record(self.clock.now(), t1 - t0, t2 - t1, 1, *(counts() if counts else ()))
+        return steps
+
+class TkBackend:
+    """Runs a game in a Tk root: widgets go into the root, key and mouse
+    events are queued for the game, and frames are scheduled with after()
+    against a monotonic deadline. A paced game gets one frame per step
+    instead, each scheduled for the moment its step is due, so a step that
+    changes length lands on time rather than on the next 16 ms frame; its
+    frame lateness is then how late its steps run. stop() takes down
+    everything the game built, so one root can host one game after another
+    (see launcher.py)."""
+
+    headless = False
+
+    def __init__(self, root, frame_ms=FRAME_MS, on_quit=None):
+        self.root = root
+        self.on_quit = on_quit      # called instead of root.quit() when set
+        self.clock = Clock()
+        self.inputs = InputQueue()
+        self.frame_time = frame_ms / 1000
+        self.lateness = deque(maxlen=120)   # how late recent frames fired, seconds
+        self.game = None
+        self.job = None
+        self.widgets = []       # top-level widgets the game made
+        self.bound = []         # (widget, sequence) bindings to undo
+        self.telemetry = None   # telemetry.Recorder while one is open
+
+    def title(self, text):
+        self.root.title(text)
+
+    def resizable(self, width, height):
+        self.root.resizable(width, height)
+
+    def widget(self, kind, parent=None, **options):
+        import tkinter as tk
+        w = getattr(tk, kind)(parent or self.root, **options)
+        if parent is None:
+            self.widgets.append(w)
+        return w
+
+    def image(self, width, height):
+        # a blank PhotoImage; Tk frees it once the game drops its reference
+        import tkinter as tk
+        return tk.PhotoImage(master=self.root, width=width, height=height)
+
+    def bind(self, sequence, name=None, widget=None):
+        name = name or sequence
+        widget = widget or self.root
+        widget.bind(sequence, lambda e: self.inputs.push(name, e))
+        self.bound.append((widget, sequence))
+
+    def on_close(self, callback):
+        self.root.protocol("WM_DELETE_WINDOW", callback)
+
+    def message(self, title, text):
+        from tkinter import messagebox
+        messagebox.showinfo(title, text, parent=self.root)
+
+    def quit(self):
+        if self.on_quit:
+            self.on_quit()
+        else:
+            self.root.quit()
+
+    def frame_stats(self):
+        # average, 95th percentile and worst frame lateness, in ms
+        late = sorted(self.lateness)
+        if not late:
+            return 0.0, 0.0, 0.0
+        return (sum(late) / len(late) * 1000,
+                late[min(len(late) - 1, int(len(late) * 0.95))] * 1000,
+                late[-1] * 1000)
+
+    def run(self, game):
+        self.game = game
+        self.paced = getattr(game, "paced", False)
+        self.scheduler = FixedStep(game.step, self.clock)
+        self.deadline = self.clock.now()
+        self.telemetry = open_recorder(game)
+        self.counts = getattr(game, "counts", None)
+        if self.paced:
+            # the first step is due a whole step from now, like every later one
+            self.deadline += game.step
+            self.job = self.root.after(math.ceil(game.step * 1000), self.frame)
+        else:
+            self.frame()
+
+    def stop(self):
+        # cancel the frame loop, let the game release what it holds (close()),
+        # then undo its bindings and destroy its widgets
+        if self.job:
+            self.root.after_cancel(self.job)
+        self.job = None
+        game, self.game = self.game, None
+        if game is not None and hasattr(game, "close"):
+            game.close()
+        for widget, sequence in self.bound:
+            if widget is self.root:
+                widget.unbind(sequence)
+        for w in self.widgets:
+            w.destroy()
+        self.bound.clear()
+        self.widgets.clear()
+        self.inputs.clear()
+        self.close_telemetry()
+
+    def close_telemetry(self):
+        if self.telemetry:
+            self.telemetry.close()
+            self.telemetry = None
+
+    def frame(self):
+        now = self.clock.now()
+        self.lateness.append(now - self.deadline)
+        game = self.game
+        if self.paced:
+            due, alpha, step = 1, 1.0, game.step
+            self.scheduler.steps += 1
+        else:
+            due, alpha = self.scheduler.advance()
+            step = self.scheduler.step
+        for _ in range(due):
+            game.update(step)
+            if self.game is not game:
+                return      # stopped (or replaced) from inside update
+        if self.telemetry:
+            updated = self.clock.now()
+            game.draw(alpha)
+            counts = self.counts() if self.counts else ()
+            self.telemetry.record(now, updated - now, self.clock.now() - updated, due, *counts)
+        else:
+            game.draw(alpha)
+        # next frame against the ideal deadline; resync if a whole frame behind.
+        # A paced game's next frame is its next step, at its current length.
+        self.deadline = max(self.deadline + (game.step if self.paced else self.frame_time), now)
+        delay = math.ceil((self.deadline - self.clock.now()) * 1000)
+        self.job = self.root.after(max(0, delay), self.frame)
+
+def run_tk(make_game):
+    # the usual __main__: one Tk root, one game, mainloop
+    import tkinter as tk
+    root = tk.Tk()
+    backend = TkBackend(root)
+    backend.run(make_game(backend))
+    root.mainloop()
+    backend.close_telemetry()
@@ -0,0 +1,19 @@
+import time
+
+class Clock:
+    """Monotonic seconds (perf_counter); never jumps when the wall clock does."""
+
+    def now(self):
+        return time.perf_counter()
+
+class ManualClock:
+    """A clock that only moves when told to, so headless runs are deterministic."""
+
+    def __init__(self, start=0.0):
+        self.t = start
+
+    def now(self):
+        return self.t
+
+    def advance(self, dt):
+        self.t += dt
@@ -0,0 +1,31 @@
+from collections import deque
+
+class InputQueue:
+    """Bounded FIFO of (name, event) pairs.
+
+    Backends push as input arrives; the game drains it at the start of an
+    update, so input is handled at a known point in the step. When full, new
+    events are dropped (and counted) rather than pushing out older ones.
+    """
+
+    def __init__(self, maxlen=64):
+        self.events = deque()
+        self.maxlen = maxlen
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self.events)
+
+    def push(self, name, event=None):
+        if len(self.events) >= self.maxlen:
+            self.dropped += 1
+            return
+        self.events.append((name, event))
+
+    def drain(self):
+        events = self.events
+        while events:
+            yield events.popleft()
+
+    def clear(self):
+        self.events.clear()
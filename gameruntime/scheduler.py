@@ -0,0 +1,28 @@
+class FixedStep:
+    """Fixed-timestep accumulator.
+
+    Each frame, advance() banks the real time since the last frame (capped at
+    max_frame, so a stall doesn't turn into a burst of catch-up) and says how
+    many `step`-long updates are due, plus how far into the next step the
+    frame falls, for interpolated drawing.
+    """
+
+    def __init__(self, step, clock, max_frame=0.25):
+        self.step = step
+        self.clock = clock
+        self.max_frame = max_frame
+        self.steps = 0
+        self.reset()
+
+    def reset(self):
+        self.last = self.clock.now()
+        self.accumulator = 0.0
+
+    def advance(self):
+        now = self.clock.now()
+        self.accumulator += min(now - self.last, self.max_frame)
+        self.last = now
+        due = int(self.accumulator / self.step)
+        self.accumulator -= due * self.step
+        self.steps += due
+        return due, self.accumulator / self.step
@@ -0,0 +1,71 @@
+"""Per-frame telemetry in a memory-mapped ring buffer, and a reader for it.
+
+A backend with a Recorder writes one fixed-size record per frame: when the
+frame started, how long its updates and its draw took, how many fixed steps
+ran, and the game's entity and canvas item counts (from game.counts(), if
+the game has one). Recording is a struct.pack_into into the mapping plus a
+header update, so it costs about a microsecond; the OS writes the pages out
+on its own. Once the ring is full the oldest frames are overwritten.
+
+Set GAME_TELEMETRY=<dir> to record every game run with TkBackend into
+<dir>/<GameClass>.ftel; gameruntime/analyze.py reads the files back.
+"""
+
+import mmap
+import os
+import struct
+
+MAGIC = b"FTEL"
+VERSION = 1
+# magic, version, record size, capacity, records written, game name
+HEADER = struct.Struct("<4sHHIQ32s")
+HEADER_SIZE = 64
+COUNT_AT = 12                   # offset of "records written" in the header
+COUNT = struct.Struct("<Q")
+# frame start (clock seconds), update us, draw us, steps, entities, canvas items
+RECORD = struct.Struct("<dIIIII")
+CAPACITY = 1 << 16              # frames kept, about 18 minutes at 60 fps
+
+class Recorder:
+    def __init__(self, path, game, capacity=CAPACITY):
+        self.capacity = capacity
+        size = HEADER_SIZE + capacity * RECORD.size
+        with open(path, "wb") as f:
+            f.truncate(size)
+        self.file = open(path, "r+b")
+        self.map = mmap.mmap(self.file.fileno(), size)
+        HEADER.pack_into(self.map, 0, MAGIC, VERSION, RECORD.size, capacity, 0, game.encode()[:32])
+        self.count = 0
+
+    def record(self, start, update_s, draw_s, steps, entities=0, items=0):
+        RECORD.pack_into(self.map, HEADER_SIZE + (self.count % self.capacity) * RECORD.size,
+                         start, int(update_s * 1e6), int(draw_s * 1e6), steps, entities, items)
+        self.count += 1
+        COUNT.pack_into(self.map, COUNT_AT, self.count)
+
+    def close(self):
+        self.map.flush()
+        self.map.close()
+        self.file.close()
+
+def open_recorder(game):
+    # the GAME_TELEMETRY hook: a Recorder for this game, or None
+    folder = os.environ.get("GAME_TELEMETRY")
+    if not folder:
+        return None
+    os.makedirs(folder, exist_ok=True)
+    name = type(game).__name__
+    return Recorder(os.path.join(folder, name + ".ftel"), name)
+
+def read(path):
+    """(game name, records oldest first) from a telemetry file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, size, capacity, count, name = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION or size != RECORD.size:
+        raise ValueError(f"{path}: not a telemetry file (or another version)")
+    n = min(count, capacity)
+    first = count - n
+    records = [RECORD.unpack_from(data, HEADER_SIZE + ((first + i) % capacity) * RECORD.size)
+               for i in range(n)]
+    return name.rstrip(b"\0").decode(), records
@@ -0,0 +1,119 @@
+"""One window for all the games.
+
+The launcher owns the only Tk root. A game module is imported the first time
+it is picked and stays loaded, so switching games costs a widget rebuild, not
+a new interpreter and a new Tk. Esc goes back to the menu.
+
+    python launcher.py                # the menu
+    python launcher.py --importtime   # what importing each game costs
+"""
+
+import importlib
+import os
+import subprocess
+import sys
+import time
+import tkinter as tk
+
+from gameruntime import TkBackend
+
+# --- Games: menu label, module, class. Modules load on first pick. ---
+GAMES = [
+    ("Snake", "snake", "SnakeGame"),
+    ("Snake - Arena", "snake", "ArenaGame"),
+    ("Space Invaders", "spaceinvaders", "SpaceInvaders"),
+    ("Block Breaker", "block_breaker", "Breakout"),
+    ("Clash Royale", "clash_royal_v5", "Game"),
+    ("Minesweeper", "minesweeper", "Minesweeper"),
+    ("Minesweeper - Endless", "minesweeper", "EndlessMinesweeper"),
+]
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+class Launcher:
+    def __init__(self, root):
+        self.root = root
+        self.backend = None
+        self.menu = None
+        self.import_ms = {}     # module -> ms its first import took
+        root.bind("<Escape>", lambda e: self.show_menu())
+        root.protocol("WM_DELETE_WINDOW", self.exit)
+        self.show_menu()
+
+    def show_menu(self):
+        if self.backend:
+            self.backend.stop()     # game.close(), unbind, destroy its widgets
+            self.backend = None
+        if self.menu:
+            return
+        self.root.title("Games")
+        self.root.resizable(True, True)
+        self.menu = tk.Frame(self.root, padx=20, pady=20)
+        self.menu.pack()
+        tk.Label(self.menu, text="Pick a game (Esc comes back here)", font=("Arial", 14)).pack(pady=(0, 10))
+        for label, module, cls in GAMES:
+            tk.Button(self.menu, text=label, width=24,
+                      command=lambda g=(label, module, cls): self.start(*g)).pack(pady=2)
+        if self.import_ms:
+            loaded = ", ".join(f"{m} {ms:.0f} ms" for m, ms in self.import_ms.items())
+            tk.Label(self.menu, text=f"Imported: {loaded}", fg="gray40").pack(pady=(10, 0))
+
+    def load(self, module):
+        # import on first use and remember what it cost
+        if module not in sys.modules:
+            start = time.perf_counter()
+            importlib.import_module(module)
+            self.import_ms[module] = (time.perf_counter() - start) * 1000
+        return sys.modules[module]
+
+    def start(self, label, module, cls):
+        self.menu.destroy()
+        self.menu = None
+        start = time.perf_counter()
+        game_class = getattr(self.load(module), cls)
+        loaded = time.perf_counter()
+        # a game that quits (game over boxes, its own close handler) comes back
+        # to the menu; deferred so the game finishes the update it is in
+        self.backend = TkBackend(self.root, on_quit=lambda: self.root.after_idle(self.show_menu))
+        self.backend.run(game_class(self.backend))
+        # the window's close button always means the launcher; stop() still
+        # gives the game its close()
+        self.root.protocol("WM_DELETE_WINDOW", self.exit)
+        done = time.perf_counter()
+        print(f"{label}: import {(loaded - start) * 1000:.1f} ms, start {(done - loaded) * 1000:.1f} ms")
+
+    def exit(self):
+        if self.backend:
+            self.backend.stop()
+        self.root.destroy()
+
+# --- Startup report ---
+def import_cost(module):
+    # (self, cumulative) microseconds from a fresh interpreter's -X importtime
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=HERE, capture_output=True, text=True)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line.split("|")
+        if fields[-1].strip() == module and fields[-1].startswith(" " + module):
+            return int(fields[0].split(":")[1]), int(fields[1])
+    raise RuntimeError(f"import {module} failed:\n{result.stderr[-500:]}")
+
+def report_import_times():
+    # Shared imports are paid once per launcher; each game's own cost is paid
+    # on its first pick. Cumulative includes everything not already imported
+    # by the interpreter at startup.
+    print(f"{'module':>16} {'self ms':>8} {'cumulative ms':>14}")
+    modules = ["tkinter", "gameruntime"] + list(dict.fromkeys(m for _, m, _ in GAMES))
+    for module in modules:
+        own, total = import_cost(module)
+        print(f"{module:>16} {own / 1000:8.1f} {total / 1000:14.1f}")
+
+if __name__ == "__main__":
+    if "--importtime" in sys.argv:
+        report_import_times()
+        sys.exit()
+    root = tk.Tk()
+    Launcher(root)
+    root.mainloop()
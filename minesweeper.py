@@ -0,0 +1,990 @@
+
+
+
+import random
+import sys
+import os
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+
+from gameruntime import run_tk
+
+# board drawing
+CELL = 24           # pixels per cell
+VIEW_ROWS = 20      # largest viewport, in cells; bigger boards scroll
+VIEW_COLS = 30
+NUMBER_COLORS = {1: "blue", 2: "green", 3: "red", 4: "navy", 5: "maroon", 6: "teal", 7: "black", 8: "gray"}
+
+# no-guess generation
+NO_GUESS_MAX_CELLS = 10000   # bigger boards skip the solver and just keep the first click safe
+NO_GUESS_BUDGET = 2.0        # seconds each pool worker searches before giving up
+
+# endless mode
+CHUNK_SHIFT = 5
+CHUNK = 1 << CHUNK_SHIFT     # chunks are CHUNK x CHUNK cells
+ENDLESS_DENSITY = 0.18
+MAX_LOADED_CHUNKS = 256      # player state beyond this goes to disk, least recently used first
+STORE_COMMIT_EVERY = 32      # evicted chunks written per SQLite commit; a crash loses at most this many
+FLOOD_STEP = 5000            # cells opened per update while a big area floods
+
+# --- Board model (no Tk) ---
+class Board:
+    def __init__(self, rows, cols, mines):
+        self.rows = rows
+        self.cols = cols
+        self.mines = mines
+
+        # Board state is kept as bitboards: one Python int per row and layer,
+        # bit c set for column c. That is about one bit per cell per layer.
+        self.full_row = (1 << cols) - 1
+        self.mine_rows = [0] * rows
+        self.empty_rows = [0] * rows      # safe cells with no adjacent mines
+        self.revealed_rows = [0] * rows
+        self.flagged_rows = [0] * rows
+        # counters kept up to date on every change so win/loss checks are O(1)
+        self.safe_cells = rows * cols - mines
+        self.revealed_safe = 0
+        self.flags = 0
+
+    def place_mines(self, rng=random, safe=None):
+        # Sample mine cells without replacement, keeping the 3x3 block around
+        # `safe` clear; when the mines don't leave room for that, only `safe`
+        # itself (or nothing, on a board that is all mines). The safe block is
+        # swapped with the tail of the index range so each draw is one lookup,
+        # and dense boards sample the safe cells instead of the mines, so cost
+        # doesn't blow up near rows*cols.
+        rows, cols = self.rows, self.cols
+        zone = set()
+        if safe is not None:
+            sr, sc = safe
+            zone = {r * cols + c for r in range(max(0, sr - 1), min(rows, sr + 2))
+                    for c in range(max(0, sc - 1), min(cols, sc + 2))}
+            if self.mines > rows * cols - len(zone):
+                zone = {sr * cols + sc} if self.mines < rows * cols else set()
+        allowed = rows * cols - len(zone)
+        if self.mines > allowed:
+            raise ValueError("too many mines for this board")
+        tail = [i for i in range(allowed, rows * cols) if i not in zone]
+        remap = dict(zip(sorted(i for i in zone if i < allowed), tail))
+
+        dense = self.mines > allowed // 2
+        picks = rng.sample(range(allowed), allowed - self.mines if dense else self.mines)
+        mine_rows = [self.full_row] * rows if dense else [0] * rows
+        for j in picks:
+            r, c = divmod(remap.get(j, j), cols)
+            mine_rows[r] ^= 1 << c
+        if dense:
+            for i in zone:
+                r, c = divmod(i, cols)
+                mine_rows[r] &= ~(1 << c)
+        self.set_mines(mine_rows)
+
+    def set_mines(self, mine_rows):
+        self.mine_rows = list(mine_rows)
+        self.compute_counts()
+
+    def compute_counts(self):
+        # Neighbour information is computed once here instead of on every reveal.
+        # A cell is "empty" when no mine touches it: spread each mine row one
+        # column both ways, OR the rows above/below in, and invert.
+        full = self.full_row
+        spread = [(m | m << 1 | m >> 1) & full for m in self.mine_rows]
+        for r in range(self.rows):
+            touched = spread[r]
+            if r > 0:
+                touched |= spread[r - 1]
+            if r < self.rows - 1:
+                touched |= spread[r + 1]
+            self.empty_rows[r] = full & ~touched
+
+    def count_adjacent_mines(self, r, c):
+        count = 0
+        for rr in range(max(0, r - 1), min(self.rows, r + 2)):
+            # the three columns c-1..c+1 of this row (shift left first so c=0 works)
+            count += ((self.mine_rows[rr] << 1) >> c & 0b111).bit_count()
+        if self.mine_rows[r] >> c & 1:
+            count -= 1
+        return count
+
+    def is_mine(self, r, c):
+        return self.mine_rows[r] >> c & 1
+
+    def is_flagged(self, r, c):
+        return self.flagged_rows[r] >> c & 1
+
+    def reveal(self, r, c):
+        # reveal a safe cell (flood filling from empty ones); returns cells opened
+        opened = self.flood_reveal(r, c)
+        self.revealed_safe += opened
+        return opened
+
+    def won(self):
+        return self.revealed_safe == self.safe_cells
+
+    @staticmethod
+    def run_at(mask, c):
+        # column span [x, y) of the run of set bits in mask that contains bit c
+        t = mask >> c
+        y = c + (~t & (t + 1)).bit_length() - 1
+        x = (~mask & ((1 << c) - 1)).bit_length()
+        return x, y
+
+    def flood_reveal(self, r, c):
+        # Iterative BFS over row spans of the bitboards. Each queued span is a run
+        # of empty cells; every hidden cell touching it in the rows above, below
+        # and beside is opened, and empty ones among them queue their whole run.
+        # Returns the number of newly revealed cells.
+        empty_rows = self.empty_rows
+        revealed_rows = self.revealed_rows
+        flagged_rows = self.flagged_rows
+        bit = 1 << c
+        if (revealed_rows[r] | flagged_rows[r]) & bit:
+            return 0
+        if not empty_rows[r] & bit:
+            revealed_rows[r] |= bit
+            return 1
+        x, y = self.run_at(empty_rows[r] & ~flagged_rows[r] & ~revealed_rows[r], c)
+        span = ((1 << y) - 1) ^ ((1 << x) - 1)
+        revealed_rows[r] |= span
+        opened = y - x
+        spans = [(r, x, y)]
+        while spans:
+            r, x, y = spans.pop()
+            window = (((1 << (y + 1)) - 1) ^ ((1 << max(x - 1, 0)) - 1)) & self.full_row
+            for rr in (r - 1, r, r + 1):
+                if not 0 <= rr < self.rows:
+                    continue
+                closed = revealed_rows[rr] | flagged_rows[rr]
+                hidden = window & ~closed
+                if not hidden:
+                    continue
+                open_empty = empty_rows[rr] & ~closed
+                grow = hidden & open_empty
+                while grow:
+                    gx, gy = self.run_at(open_empty, (grow & -grow).bit_length() - 1)
+                    run = ((1 << gy) - 1) ^ ((1 << gx) - 1)
+                    hidden |= run
+                    grow &= ~run
+                    spans.append((rr, gx, gy))
+                revealed_rows[rr] |= hidden
+                opened += hidden.bit_count()
+        return opened
+
+    def toggle_flag(self, r, c):
+        bit = 1 << c
+        if self.revealed_rows[r] & bit:
+            return False
+        self.flagged_rows[r] ^= bit
+        self.flags += 1 if self.flagged_rows[r] & bit else -1
+        return True
+
+# --- Solver ---
+def bits_of(mask):
+    # indices of the set bits in mask, lowest first
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+class Solver:
+    """Constraint-propagation solver over a rectangular region of a Board.
+
+    Only what a player can see is used: revealed cells and their numbers. Cells
+    in the region are numbered row-major and every cell set is an int bitset,
+    so subset tests and set differences are single integer operations.
+    """
+
+    def __init__(self, board, r0=0, r1=None, c0=0, c1=None):
+        self.board = board
+        self.r0, self.r1 = r0, board.rows if r1 is None else r1
+        self.c0, self.c1 = c0, board.cols if c1 is None else c1
+        self.width = self.c1 - self.c0
+        self.whole_board = (self.r0, self.r1, self.c0, self.c1) == (0, board.rows, 0, board.cols)
+        self.known_mines = 0   # region bitset of cells proven to be mines
+
+    def cells(self, mask):
+        # board (row, col) of every set bit in a region bitset
+        for i in bits_of(mask):
+            r, c = divmod(i, self.width)
+            yield r + self.r0, c + self.c0
+
+    def unknown_bits(self):
+        wmask = (1 << self.width) - 1
+        bits = 0
+        for r in range(self.r0, self.r1):
+            hidden = (~self.board.revealed_rows[r] >> self.c0) & wmask
+            bits |= hidden << ((r - self.r0) * self.width)
+        return bits & ~self.known_mines
+
+    def frontier_constraints(self, unknown):
+        # One constraint per revealed number that still touches unknown cells:
+        # {bitset of its unknown neighbours: mines still missing among them}.
+        # Only numbers whose whole neighbourhood lies inside the region count.
+        board = self.board
+        width = self.width
+        wmask = (1 << width) - 1
+        ra = self.r0 if self.r0 == 0 else self.r0 + 1
+        rb = self.r1 if self.r1 == board.rows else self.r1 - 1
+        ca = self.c0 if self.c0 == 0 else self.c0 + 1
+        cb = self.c1 if self.c1 == board.cols else self.c1 - 1
+        constraints = {}
+        for r in range(ra, rb):
+            numbers = (board.revealed_rows[r] & ~board.empty_rows[r]) >> ca
+            for i in bits_of(numbers & ((1 << (cb - ca)) - 1)):
+                c = ca + i
+                pattern = ((0b111 << (c - self.c0)) >> 1) & wmask
+                around = 0
+                for rr in range(max(0, r - 1), min(board.rows, r + 2)):
+                    around |= pattern << ((rr - self.r0) * width)
+                unk = around & unknown
+                if unk:
+                    constraints[unk] = board.count_adjacent_mines(r, c) - (around & self.known_mines).bit_count()
+        return constraints
+
+    def deduce(self):
+        # Returns (safe, mines) region bitsets proven by the current view.
+        unknown = self.unknown_bits()
+        constraints = self.frontier_constraints(unknown)
+        safe = mines = 0
+        by_cell = {}
+        queue = list(constraints.items())
+        while queue:
+            mask, need = queue.pop()
+            need -= (mask & mines).bit_count()
+            mask &= ~(safe | mines)
+            size = mask.bit_count()
+            if not size:
+                continue
+            if need == 0:
+                safe |= mask
+                continue
+            if need == size:
+                mines |= mask
+                continue
+            # pair rules against every stored constraint sharing a cell with this one
+            others = set()
+            for cell in bits_of(mask):
+                others.update(by_cell.get(cell, ()))
+            for other, oneed in others:
+                oneed -= (other & mines).bit_count()
+                other &= ~(safe | mines)
+                if not other or other == mask:
+                    continue
+                only_mine = mask & ~other
+                only_other = other & ~mask
+                if not only_mine:
+                    # subset: the rest of `other` holds the difference
+                    derived = (only_other, oneed - need)
+                elif not only_other:
+                    derived = (only_mine, need - oneed)
+                elif oneed - need == only_other.bit_count():
+                    # every extra mine of `other` must sit outside the overlap
+                    mines |= only_other
+                    safe |= only_mine
+                    continue
+                elif need - oneed == only_mine.bit_count():
+                    mines |= only_mine
+                    safe |= only_other
+                    continue
+                else:
+                    continue
+                if derived[0] not in constraints:
+                    constraints[derived[0]] = derived[1]
+                    queue.append(derived)
+            for cell in bits_of(mask):
+                by_cell.setdefault(cell, []).append((mask, need))
+        if not (safe or mines) and self.whole_board:
+            # global count: all remaining mines, or none, among the unknown cells
+            left = self.board.mines - self.known_mines.bit_count()
+            if left == 0:
+                safe = unknown
+            elif left == unknown.bit_count():
+                mines = unknown
+        return safe, mines
+
+    def find_safe(self):
+        # keep deducing (mines found help later rounds) until a safe cell shows up
+        while True:
+            safe, mines = self.deduce()
+            if safe:
+                return next(self.cells(safe))
+            if not mines:
+                return None
+            self.known_mines |= mines
+
+def solve(board, start):
+    # Play the board from `start` using only deductions. True if no guess was needed.
+    board.reveal(*start)
+    solver = Solver(board)
+    while not board.won():
+        safe, mines = solver.deduce()
+        if not (safe or mines):
+            return False
+        solver.known_mines |= mines
+        for r, c in solver.cells(safe):
+            board.reveal(r, c)
+    return True
+
+def generate_no_guess(rows, cols, mines, start, seed, budget=NO_GUESS_BUDGET):
+    # Pool worker: draw boards until one is solvable from `start` or time runs out.
+    # Returns (mine_rows or None, boards tried).
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + budget
+    tries = 0
+    while True:
+        tries += 1
+        board = Board(rows, cols, mines)
+        board.place_mines(rng, safe=start)
+        if solve(board, start):
+            return board.mine_rows, tries
+        if time.perf_counter() > deadline:
+            return None, tries
+
+def bench_worker(rows, cols, mines, seconds, seed):
+    # Pool worker for --bench: (boards checked, boards solvable) in `seconds`.
+    rng = random.Random(seed)
+    start = (rows // 2, cols // 2)
+    checked = solved = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        board = Board(rows, cols, mines)
+        board.place_mines(rng, safe=start)
+        checked += 1
+        solved += solve(board, start)
+    return checked, solved
+
+def run_benchmark(seconds=2.0):
+    from concurrent.futures import ProcessPoolExecutor
+    workers = os.cpu_count() or 1
+    print(f"no-guess generation, {workers} worker processes, {seconds:.0f}s per case")
+    print(f"{'board':>10} {'mines':>6} {'density':>8} {'checked/s':>10} {'solved/s':>9} {'no-guess':>9}")
+    cases = [(9, 9, 10), (16, 16, 40), (16, 30, 99), (30, 30, 130), (30, 30, 180), (50, 50, 400)]
+    with ProcessPoolExecutor(workers) as pool:
+        for rows, cols, mines in cases:
+            jobs = [pool.submit(bench_worker, rows, cols, mines, seconds, seed) for seed in range(workers)]
+            results = [job.result() for job in jobs]
+            checked = sum(r[0] for r in results)
+            solved = sum(r[1] for r in results)
+            print(f"{rows:>4}x{cols:<5} {mines:>6} {mines / (rows * cols):>8.1%} {checked / seconds:>10.1f}"
+                  f" {solved / seconds:>9.1f} {solved / max(1, checked):>9.1%}")
+
+# --- Endless mode (no Tk) ---
+@lru_cache(maxsize=1024)
+def chunk_mines(seed, density, cx, cy):
+    # Mine rows of one chunk. Depends only on the seed and chunk coordinates,
+    # so chunks can be dropped and regenerated at will.
+    rng = random.Random(f"{seed}/{cx}/{cy}")
+    picks = rng.sample(range(CHUNK * CHUNK), round(density * CHUNK * CHUNK))
+    rows = [0] * CHUNK
+    for i in picks:
+        r, c = divmod(i, CHUNK)
+        rows[r] |= 1 << c
+    if (cx, cy) == (0, 0):
+        # the starting cell in the middle of chunk 0,0 and its neighbours are safe
+        mid = CHUNK // 2
+        for r in range(mid - 1, mid + 2):
+            rows[r] &= ~(0b111 << (mid - 1))
+    return tuple(rows)
+
+class Chunk:
+    def __init__(self, cx, cy, mines, counts):
+        self.cx = cx
+        self.cy = cy
+        self.mine_rows = mines
+        self.counts = counts      # bytearray of adjacent-mine counts, row-major
+        self.revealed_rows = [0] * CHUNK
+        self.flagged_rows = [0] * CHUNK
+        self.dirty = False
+
+class ChunkStore:
+    """Player state of evicted chunks, kept in a small SQLite file.
+
+    Each chunk is two packed bit layers (revealed, flagged) of CHUNK*CHUNK/8
+    bytes. Mines are never stored; they are regenerated from the seed. Saves
+    are committed every STORE_COMMIT_EVERY chunks and on close().
+    """
+
+    def __init__(self, path):
+        import sqlite3   # only endless mode needs it; keeps the module quick to import
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("CREATE TABLE IF NOT EXISTS chunks (cx INTEGER, cy INTEGER, revealed BLOB, flagged BLOB,"
+                        " PRIMARY KEY (cx, cy)) WITHOUT ROWID")
+        self.saved = 0
+
+    @staticmethod
+    def pack(rows):
+        return b"".join(r.to_bytes(CHUNK // 8, "little") for r in rows)
+
+    @staticmethod
+    def unpack(blob):
+        n = CHUNK // 8
+        return [int.from_bytes(blob[i:i + n], "little") for i in range(0, len(blob), n)]
+
+    def save(self, chunk):
+        self.db.execute("INSERT OR REPLACE INTO chunks VALUES (?, ?, ?, ?)",
+                        (chunk.cx, chunk.cy, self.pack(chunk.revealed_rows), self.pack(chunk.flagged_rows)))
+        self.saved += 1
+        if self.saved % STORE_COMMIT_EVERY == 0:
+            self.db.commit()
+
+    def load(self, cx, cy):
+        row = self.db.execute("SELECT revealed, flagged FROM chunks WHERE cx = ? AND cy = ?", (cx, cy)).fetchone()
+        if row is None:
+            return None
+        return self.unpack(row[0]), self.unpack(row[1])
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+class EndlessBoard:
+    """An unbounded board split into CHUNK x CHUNK chunks, made on first use.
+
+    Cells use world coordinates (x, y), any integers. At most MAX_LOADED_CHUNKS
+    chunks stay in memory; the least recently used one is written to the
+    ChunkStore when another is needed and read back when it is revisited.
+    """
+
+    def __init__(self, seed, density=ENDLESS_DENSITY, store_path=None, max_chunks=MAX_LOADED_CHUNKS):
+        self.seed = seed
+        self.density = density
+        self.max_chunks = max_chunks
+        self.loaded = OrderedDict()      # (cx, cy) -> Chunk, oldest first
+        self.own_store = store_path is None
+        if store_path is None:
+            import tempfile
+            fd, store_path = tempfile.mkstemp(prefix="minesweeper-", suffix=".db")
+            os.close(fd)
+        self.store = ChunkStore(store_path)
+        self.flood = deque()             # empty cells still to spread from
+        self.revealed_safe = 0
+        self.flags = 0
+        self.start = (CHUNK // 2, CHUNK // 2)
+
+    def chunk(self, cx, cy):
+        key = (cx, cy)
+        chunk = self.loaded.get(key)
+        if chunk is not None:
+            self.loaded.move_to_end(key)
+            return chunk
+        chunk = Chunk(cx, cy, chunk_mines(self.seed, self.density, cx, cy), self.chunk_counts(cx, cy))
+        saved = self.store.load(cx, cy)
+        if saved:
+            chunk.revealed_rows, chunk.flagged_rows = saved
+        self.loaded[key] = chunk
+        if len(self.loaded) > self.max_chunks:
+            _, old = self.loaded.popitem(last=False)
+            if old.dirty:
+                self.store.save(old)
+        return chunk
+
+    def chunk_counts(self, cx, cy):
+        # Adjacent-mine counts for every cell of a chunk. Mine rows are padded
+        # with one column/row borrowed from the eight neighbouring chunks (their
+        # mines only, not their state), then each count is three 3-bit windows.
+        def mines(nx, ny):
+            return chunk_mines(self.seed, self.density, nx, ny)
+        last = CHUNK - 1
+        padded = []
+        for ny, rows in ((cy - 1, (last,)), (cy, range(CHUNK)), (cy + 1, (0,))):
+            left, mid, right = mines(cx - 1, ny), mines(cx, ny), mines(cx + 1, ny)
+            for r in rows:
+                padded.append(left[r] >> last | mid[r] << 1 | (right[r] & 1) << (CHUNK + 1))
+        counts = bytearray(CHUNK * CHUNK)
+        i = 0
+        for r in range(CHUNK):
+            above, row, below = padded[r], padded[r + 1], padded[r + 2]
+            for c in range(CHUNK):
+                counts[i] = ((above >> c & 7).bit_count() + (row >> c & 7).bit_count()
+                             + (below >> c & 7).bit_count())
+                i += 1
+        return counts
+
+    def locate(self, x, y):
+        return self.chunk(x >> CHUNK_SHIFT, y >> CHUNK_SHIFT), x & (CHUNK - 1), y & (CHUNK - 1)
+
+    def is_mine(self, x, y):
+        chunk, c, r = self.locate(x, y)
+        return chunk.mine_rows[r] >> c & 1
+
+    def is_revealed(self, x, y):
+        chunk, c, r = self.locate(x, y)
+        return chunk.revealed_rows[r] >> c & 1
+
+    def is_flagged(self, x, y):
+        chunk, c, r = self.locate(x, y)
+        return chunk.flagged_rows[r] >> c & 1
+
+    def count_adjacent_mines(self, x, y):
+        chunk, c, r = self.locate(x, y)
+        return chunk.counts[r * CHUNK + c] - (chunk.mine_rows[r] >> c & 1)
+
+    def open_cell(self, x, y):
+        # reveal one hidden, unflagged cell; queue it for spreading if empty
+        chunk, c, r = self.locate(x, y)
+        bit = 1 << c
+        if (chunk.revealed_rows[r] | chunk.flagged_rows[r]) & bit:
+            return 0
+        chunk.revealed_rows[r] |= bit
+        chunk.dirty = True
+        if not chunk.counts[r * CHUNK + c]:
+            self.flood.append((x, y))
+        return 1
+
+    def reveal(self, x, y):
+        # Open a safe cell and start flooding from it. Big areas keep going in
+        # continue_flood() so one click never blocks for long.
+        opened = self.open_cell(x, y)
+        self.revealed_safe += opened
+        return opened + self.continue_flood()
+
+    def continue_flood(self, limit=FLOOD_STEP):
+        # iterative BFS across chunk borders, at most `limit` cells per call
+        flood = self.flood
+        opened = 0
+        while flood and opened < limit:
+            x, y = flood.popleft()
+            for ny in (y - 1, y, y + 1):
+                for nx in (x - 1, x, x + 1):
+                    opened += self.open_cell(nx, ny)
+        self.revealed_safe += opened
+        return opened
+
+    def toggle_flag(self, x, y):
+        chunk, c, r = self.locate(x, y)
+        bit = 1 << c
+        if chunk.revealed_rows[r] & bit:
+            return False
+        chunk.flagged_rows[r] ^= bit
+        chunk.dirty = True
+        self.flags += 1 if chunk.flagged_rows[r] & bit else -1
+        return True
+
+    def close(self):
+        self.store.close()
+        if self.own_store:
+            os.remove(self.store.path)
+
+# --- Tk game ---
+def draw_cell(canvas, x, y, mine, revealed, flagged, count):
+    # one board cell with its top-left corner at canvas pixel (x, y)
+    if mine:
+        canvas.create_rectangle(x, y, x + CELL, y + CELL, fill="red", outline="gray50", tags="cell")
+        canvas.create_text(x + CELL / 2, y + CELL / 2, text="*", tags="cell")
+    elif revealed:
+        canvas.create_rectangle(x, y, x + CELL, y + CELL, fill="gray85", outline="gray60", tags="cell")
+        if count:
+            canvas.create_text(x + CELL / 2, y + CELL / 2, text=str(count),
+                               fill=NUMBER_COLORS[count], font=("Arial", 10, "bold"), tags="cell")
+    else:
+        canvas.create_rectangle(x + 1, y + 1, x + CELL - 1, y + CELL - 1, fill="gray75",
+                                outline="white", tags="cell")
+        if flagged:
+            canvas.create_text(x + CELL / 2, y + CELL / 2, text="F", fill="blue",
+                               font=("Arial", 10, "bold"), tags="cell")
+
+class Minesweeper:
+    step = 1 / 30      # turn-based: updates only poll generation and handle clicks
+
+    def __init__(self, backend, rows=10, cols=10, mines=15):
+        if not 0 <= mines <= rows * cols:
+            raise ValueError(f"{mines} mines don't fit on a {rows}x{cols} board")
+        self.backend = backend
+        backend.title("Minesweeper")
+        self.rows = rows
+        self.cols = cols
+        self.mines = mines
+        self.board = Board(rows, cols, mines)
+        self.mines_placed = False    # mines go down on the first click
+        self.first_click = None
+        self.generating = []         # pending no-guess pool jobs
+        self.pool = None
+        self.hint_cell = None
+        self.exploded = False
+        self.finished = False
+        self.dirty = True            # redraw the viewport at the next draw()
+        self.drawn_items = 0
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        # One canvas for the whole board. Only the cells inside the scrolled
+        # viewport get canvas items, so cost doesn't grow with the board size.
+        backend = self.backend
+        top = backend.widget("Frame")
+        top.pack(fill="x")
+        self.status = backend.widget("Label", top, text="", font=("Arial", 12))
+        self.status.pack(side="left", padx=6)
+        backend.widget("Button", top, text="Hint",
+                       command=lambda: backend.inputs.push("hint")).pack(side="right", padx=6)
+        backend.bind("h", "hint")
+        frame = backend.widget("Frame")
+        frame.pack(fill="both", expand=True)
+        self.canvas = backend.widget("Canvas", frame, width=min(self.cols, VIEW_COLS) * CELL,
+                                     height=min(self.rows, VIEW_ROWS) * CELL,
+                                     bg="gray70", highlightthickness=0,
+                                     scrollregion=(0, 0, self.cols * CELL, self.rows * CELL))
+        xbar = backend.widget("Scrollbar", frame, orient="horizontal", command=self.canvas.xview)
+        ybar = backend.widget("Scrollbar", frame, orient="vertical", command=self.canvas.yview)
+        self.canvas.config(xscrollcommand=lambda *a: self.on_scroll(xbar, *a),
+                           yscrollcommand=lambda *a: self.on_scroll(ybar, *a))
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        if self.cols > VIEW_COLS:
+            xbar.grid(row=1, column=0, sticky="ew")
+        if self.rows > VIEW_ROWS:
+            ybar.grid(row=0, column=1, sticky="ns")
+        frame.rowconfigure(0, weight=1)
+        frame.columnconfigure(0, weight=1)
+
+        for sequence, name in (("<Button-1>", "reveal"), ("<Button-3>", "flag"), ("<Configure>", "resize"),
+                               # mouse wheel: <MouseWheel> on Windows/macOS, buttons 4/5 on X11
+                               ("<MouseWheel>", "wheel"), ("<Shift-MouseWheel>", "hwheel"),
+                               ("<Button-4>", "wheel-up"), ("<Button-5>", "wheel-down")):
+            backend.bind(sequence, name, widget=self.canvas)
+        self.canvas.config(xscrollincrement=CELL, yscrollincrement=CELL)
+
+    def handle_inputs(self):
+        canvas = self.canvas
+        for name, e in self.backend.inputs.drain():
+            if name == "reveal":
+                self.on_left_click(e)
+            elif name == "flag":
+                self.on_right_click(e)
+            elif name == "hint":
+                self.hint()
+            elif name == "resize":
+                self.redraw()
+            elif name == "wheel":
+                canvas.yview_scroll(-1 if e.delta > 0 else 1, "units")
+            elif name == "hwheel":
+                canvas.xview_scroll(-1 if e.delta > 0 else 1, "units")
+            elif name == "wheel-up":
+                canvas.yview_scroll(-1, "units")
+            elif name == "wheel-down":
+                canvas.yview_scroll(1, "units")
+
+    def update(self, dt):
+        self.handle_inputs()
+        if self.generating:
+            self.check_generation()
+
+    def draw(self, alpha):
+        if self.dirty:
+            self.draw_viewport()
+            self.drawn_items = len(self.canvas.find_withtag("cell"))
+
+    def counts(self):
+        # (entities, canvas items) for frame telemetry: revealed cells, and
+        # the items of the last viewport redraw
+        return self.board.revealed_safe, self.drawn_items
+
+    def on_scroll(self, bar, first, last):
+        bar.set(first, last)
+        self.redraw()
+
+    def event_cell(self, e):
+        # map a click to a cell by arithmetic on the scrolled canvas coordinates
+        r = int(self.canvas.canvasy(e.y) // CELL)
+        c = int(self.canvas.canvasx(e.x) // CELL)
+        if 0 <= r < self.rows and 0 <= c < self.cols:
+            return r, c
+        return None
+
+    def on_left_click(self, e):
+        cell = self.event_cell(e)
+        if not cell or self.finished or self.generating:
+            return
+        if not self.mines_placed:
+            self.start_board(*cell)
+        else:
+            self.reveal_cell(*cell)
+
+    def on_right_click(self, e):
+        cell = self.event_cell(e)
+        if cell and not self.finished and self.board.toggle_flag(*cell):
+            self.redraw()
+
+    def redraw(self):
+        # coalesce scroll/reveal/flag events into one redraw per frame
+        self.dirty = True
+
+    def visible_cells(self):
+        x0 = self.canvas.canvasx(0)
+        y0 = self.canvas.canvasy(0)
+        r0 = max(0, int(y0 // CELL))
+        c0 = max(0, int(x0 // CELL))
+        r1 = min(self.rows, int((y0 + self.canvas.winfo_height()) // CELL) + 1)
+        c1 = min(self.cols, int((x0 + self.canvas.winfo_width()) // CELL) + 1)
+        return r0, r1, c0, c1
+
+    def draw_viewport(self):
+        self.dirty = False
+        board = self.board
+        if self.generating:
+            self.status.config(text="Generating a no-guess board...")
+        else:
+            self.status.config(text=f"Mines left: {self.mines - board.flags}")
+        canvas = self.canvas
+        canvas.delete("cell")
+        r0, r1, c0, c1 = self.visible_cells()
+        for r in range(r0, r1):
+            y = r * CELL
+            # shift the row bitboards once so each cell below is a low-bit test
+            mines = board.mine_rows[r] >> c0
+            revealed = board.revealed_rows[r] >> c0
+            flagged = board.flagged_rows[r] >> c0
+            for c in range(c0, c1):
+                count = board.count_adjacent_mines(r, c) if revealed & 1 else 0
+                draw_cell(canvas, c * CELL, y, self.exploded and mines & 1, revealed & 1, flagged & 1, count)
+                mines >>= 1
+                revealed >>= 1
+                flagged >>= 1
+        if self.hint_cell:
+            r, c = self.hint_cell
+            canvas.create_rectangle(c * CELL + 2, r * CELL + 2, (c + 1) * CELL - 2, (r + 1) * CELL - 2,
+                                    outline="gold", width=3, tags="cell")
+
+    # ----- board generation -----
+    def start_board(self, r, c):
+        # Mines are placed on the first click. Boards up to NO_GUESS_MAX_CELLS are
+        # drawn and checked by the solver in a process pool, so the window keeps
+        # responding; update() polls the jobs and the first no-guess board wins.
+        self.first_click = (r, c)
+        if self.rows * self.cols > NO_GUESS_MAX_CELLS:
+            self.board.place_mines(safe=(r, c))
+            self.board_ready()
+            return
+        from concurrent.futures import ProcessPoolExecutor
+        workers = os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(workers)
+        self.generating = [self.pool.submit(generate_no_guess, self.rows, self.cols, self.mines,
+                                            (r, c), random.randrange(1 << 30))
+                           for _ in range(workers)]
+        self.redraw()
+
+    def check_generation(self):
+        # a worker that failed (or a pool that broke) counts as no board found
+        for job in self.generating:
+            if job.done() and job.exception() is None and job.result()[0] is not None:
+                self.board.set_mines(job.result()[0])
+                break
+        else:
+            if not all(job.done() for job in self.generating):
+                return
+            # nobody found one in time: fall back to a board with a safe start
+            self.board.place_mines(safe=self.first_click)
+        self.generating = []
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.pool = None
+        self.board_ready()
+
+    def board_ready(self):
+        self.mines_placed = True
+        self.reveal_cell(*self.first_click)
+        self.redraw()
+
+    # ----- play -----
+    def reveal_cell(self, r, c):
+        board = self.board
+        if board.is_flagged(r, c):
+            return
+        if board.is_mine(r, c):
+            self.game_over()
+            return
+        if board.reveal(r, c):
+            self.hint_cell = None
+            self.redraw()
+            if board.won():
+                self.game_won()
+
+    def hint(self):
+        # Ask the solver for a provably safe cell around the current view.
+        if not self.mines_placed or self.finished:
+            return
+        r0, r1, c0, c1 = self.visible_cells()
+        solver = Solver(self.board, max(0, r0 - 1), min(self.rows, r1 + 1),
+                        max(0, c0 - 1), min(self.cols, c1 + 1))
+        self.hint_cell = solver.find_safe()
+        if self.hint_cell is None:
+            self.status.config(text="No safe move in view - you have to guess")
+        else:
+            self.redraw()
+
+    def close(self):
+        # stop a no-guess search that is still running
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+            self.generating = []
+
+    def game_over(self):
+        self.exploded = True
+        self.finished = True
+        self.draw_viewport()
+        self.backend.message("Game Over", "You clicked on a mine! Game Over.")
+        self.backend.quit()
+
+    def game_won(self):
+        self.finished = True
+        self.draw_viewport()
+        self.backend.message("You Win", "All safe cells revealed. You win!")
+        self.backend.quit()
+
+class EndlessMinesweeper:
+    """Tk view of an EndlessBoard. Arrow keys/WASD or middle-drag pan the camera."""
+
+    step = 1 / 60
+    PAN = {"left": (-1, 0), "right": (1, 0), "up": (0, -1), "down": (0, 1)}
+
+    def __init__(self, backend, seed=None):
+        self.backend = backend
+        backend.title("Minesweeper - Endless")
+        self.board = EndlessBoard(random.randrange(1 << 30) if seed is None else seed)
+        # camera: world pixel at the canvas top-left, start cell in the middle
+        sx, sy = self.board.start
+        self.cam_x = sx * CELL - VIEW_COLS * CELL // 2
+        self.cam_y = sy * CELL - VIEW_ROWS * CELL // 2
+        self.drag = None
+        self.exploded = False
+        self.finished = False
+        self.closed = False
+        self.dirty = True
+        self.drawn_items = 0
+
+        self.status = backend.widget("Label", text="", font=("Arial", 12))
+        self.status.pack()
+        self.canvas = backend.widget("Canvas", width=VIEW_COLS * CELL, height=VIEW_ROWS * CELL,
+                                     bg="gray70", highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True)
+        for sequence, name in (("<Button-1>", "reveal"), ("<Button-3>", "flag"), ("<Button-2>", "drag-start"),
+                               ("<B2-Motion>", "drag"), ("<Configure>", "resize")):
+            backend.bind(sequence, name, widget=self.canvas)
+        for keys, name in ((("<Left>", "a"), "left"), (("<Right>", "d"), "right"),
+                           (("<Up>", "w"), "up"), (("<Down>", "s"), "down")):
+            for key in keys:
+                backend.bind(key, name)
+        backend.on_close(self.quit)
+
+        self.board.reveal(sx, sy)
+
+    def handle_inputs(self):
+        for name, e in self.backend.inputs.drain():
+            if name in self.PAN:
+                dx, dy = self.PAN[name]
+                self.pan(dx * CELL * 4, dy * CELL * 4)
+            elif name == "reveal":
+                self.on_left_click(e)
+            elif name == "flag":
+                self.on_right_click(e)
+            elif name == "drag-start":
+                self.on_drag_start(e)
+            elif name == "drag":
+                self.on_drag(e)
+            elif name == "resize":
+                self.redraw()
+            if self.finished:
+                return
+
+    def update(self, dt):
+        self.handle_inputs()
+        if not self.finished:
+            self.keep_flooding()
+
+    def draw(self, alpha):
+        if self.dirty:
+            self.draw_viewport()
+            self.drawn_items = len(self.canvas.find_withtag("cell"))
+
+    def counts(self):
+        # (entities, canvas items) for frame telemetry: revealed cells, and
+        # the items of the last viewport redraw
+        return self.board.revealed_safe, self.drawn_items
+
+    def pan(self, dx, dy):
+        self.cam_x += dx
+        self.cam_y += dy
+        self.redraw()
+
+    def on_drag_start(self, e):
+        self.drag = (e.x, e.y)
+
+    def on_drag(self, e):
+        if self.drag:
+            self.pan(self.drag[0] - e.x, self.drag[1] - e.y)
+            self.drag = (e.x, e.y)
+
+    def event_cell(self, e):
+        return (self.cam_x + e.x) // CELL, (self.cam_y + e.y) // CELL
+
+    def on_left_click(self, e):
+        if self.finished:
+            return
+        x, y = self.event_cell(e)
+        if self.board.is_flagged(x, y):
+            return
+        if self.board.is_mine(x, y):
+            self.game_over()
+            return
+        self.board.reveal(x, y)
+        self.redraw()
+
+    def on_right_click(self, e):
+        if not self.finished and self.board.toggle_flag(*self.event_cell(e)):
+            self.redraw()
+
+    def keep_flooding(self):
+        # spread a big empty area a slice per update so the window stays live
+        if self.board.flood:
+            self.board.continue_flood()
+            self.redraw()
+
+    def redraw(self):
+        self.dirty = True
+
+    def draw_viewport(self):
+        self.dirty = False
+        board = self.board
+        self.status.config(text=f"Score: {board.revealed_safe}   Chunks in memory: {len(board.loaded)}"
+                                f"   Saved to disk: {board.store.saved}")
+        canvas = self.canvas
+        canvas.delete("cell")
+        x0, y0 = self.cam_x // CELL, self.cam_y // CELL
+        x1 = (self.cam_x + canvas.winfo_width()) // CELL + 1
+        y1 = (self.cam_y + canvas.winfo_height()) // CELL + 1
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                revealed = board.is_revealed(x, y)
+                count = board.count_adjacent_mines(x, y) if revealed else 0
+                draw_cell(canvas, x * CELL - self.cam_x, y * CELL - self.cam_y,
+                          self.exploded and board.is_mine(x, y), revealed, board.is_flagged(x, y), count)
+
+    def game_over(self):
+        self.exploded = True
+        self.finished = True
+        self.draw_viewport()
+        self.backend.message("Game Over", f"You clicked on a mine! Score: {self.board.revealed_safe}")
+        self.quit()
+
+    def close(self):
+        # drop the chunk store (and its temp file); safe to call twice
+        if not self.closed:
+            self.closed = True
+            self.board.close()
+
+    def quit(self):
+        self.close()
+        self.backend.quit()
+
+if __name__ == "__main__":
+    # optional size on the command line: rows cols mines; or --bench, or --endless [seed]
+    if "--bench" in sys.argv:
+        run_benchmark()
+        sys.exit()
+    if "--endless" in sys.argv:
+        args = sys.argv[sys.argv.index("--endless") + 1:]
+        run_tk(lambda backend: EndlessMinesweeper(backend, int(args[0]) if args else None))
+        sys.exit()
+    rows, cols, mines = (int(a) for a in sys.argv[1:4]) if len(sys.argv) >= 4 else (10, 10, 15)
+    run_tk(lambda backend: Minesweeper(backend, rows, cols, mines))
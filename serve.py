@@ -0,0 +1,340 @@
+"""Static file server for the storefront.
+
+    python serve.py [dir] [--port 8000]    # dir defaults to site/ (python build.py)
+    python serve.py --bench [dir]          # local load test, hot and cold files
+
+Bodies go out with os.sendfile, straight from the page cache to the socket.
+Every response carries a strong ETag (the file's sha256), so If-None-Match
+gets a 304. Single byte ranges are served (206, If-Range too), for resuming
+the big JPEGs and downloads. When the client accepts gzip and a
+precompressed file.gz sits next to the file, that is sent instead. Files the
+build hashed (manifest.json says immutable) are cacheable for a year; the
+rest must revalidate.
+"""
+
+import hashlib
+import http.client
+import json
+import mimetypes
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PORT = 8000
+FOREVER = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+TYPES = {".py": "text/x-python; charset=utf-8", ".html": "text/html; charset=utf-8",
+         ".css": "text/css; charset=utf-8", ".json": "application/json"}
+
+class FileInfo:
+    """What we know about one file: size, mtime, ETag and its .gz sibling."""
+    __slots__ = ("path", "size", "mtime_ns", "etag", "type", "gz", "cache")
+
+    def __init__(self, path, size, mtime_ns, etag, type, gz, cache):
+        self.path, self.size, self.mtime_ns, self.etag = path, size, mtime_ns, etag
+        self.type, self.gz, self.cache = type, gz, cache
+
+class FileTable:
+    """Path -> FileInfo, checked against stat() on every request.
+
+    Hashing a file for its ETag happens once per (size, mtime) version. The
+    build manifest's sha256 is only trusted for hashed (immutable) files,
+    whose name changes with their content; index.html and the like are
+    always hashed themselves. The manifest is read again whenever it changes
+    on disk, so a rebuild while serving is picked up.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.realpath(root)
+        self.files = {}
+        self.lock = threading.Lock()
+        self.manifest = {}
+        self.manifest_stat = None
+        self.refresh_manifest()
+
+    def refresh_manifest(self):
+        path = os.path.join(self.root, "manifest.json")
+        try:
+            st = os.stat(path)
+            version = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            version = None
+        if version == self.manifest_stat:
+            return
+        manifest = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                for entry in json.load(f).values():
+                    manifest[entry["file"]] = entry
+        except (OSError, ValueError):
+            pass
+        with self.lock:
+            self.manifest, self.manifest_stat = manifest, version
+            self.files.clear()          # cache headers may have changed
+
+    def resolve(self, url_path):
+        # URL path -> real file path inside root, or None
+        rel = unquote(url_path).lstrip("/") or "index.html"
+        path = os.path.realpath(os.path.join(self.root, rel))
+        if os.path.commonpath([path, self.root]) != self.root:
+            return None
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        return path
+
+    def lookup(self, url_path):
+        self.refresh_manifest()
+        path = self.resolve(url_path)
+        if path is None:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        info = self.files.get(path)
+        if info and info.size == st.st_size and info.mtime_ns == st.st_mtime_ns:
+            return info
+        info = self.describe(path, st)
+        with self.lock:
+            self.files[path] = info
+        return info
+
+    def describe(self, path, st):
+        name = os.path.relpath(path, self.root).replace(os.sep, "/")
+        entry = self.manifest.get(name)
+        if entry and entry.get("immutable") and entry["size"] == st.st_size:
+            digest = entry["sha256"]
+        else:
+            digest = file_sha256(path)
+        ext = os.path.splitext(path)[1]
+        type = TYPES.get(ext) or mimetypes.guess_type(path)[0] or "application/octet-stream"
+        gz = None
+        if os.path.exists(path + ".gz"):
+            gst = os.stat(path + ".gz")
+            gz = FileInfo(path + ".gz", gst.st_size, gst.st_mtime_ns, f'"{digest[:32]}-gz"', type, None, None)
+        cache = FOREVER if entry and entry.get("immutable") else REVALIDATE
+        return FileInfo(path, st.st_size, st.st_mtime_ns, f'"{digest[:32]}"', type, gz, cache)
+
+    def forget(self, url_path):
+        path = self.resolve(url_path)
+        with self.lock:
+            self.files.pop(path, None)
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def etag_matches(header, etag):
+    # If-None-Match uses the weak comparison: W/ prefixes are ignored
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+def parse_range(header, size):
+    """One `bytes=` range -> (start, end) inclusive; None to ignore the header
+    (several ranges, or not bytes); "unsatisfiable" for a 416."""
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if not first:               # suffix: the last N bytes
+            n = int(last)
+            if n == 0:
+                return "unsatisfiable"
+            return max(0, size - n), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return "unsatisfiable"
+    return start, min(end, size - 1)
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"       # keep-alive; every response has a length
+    # headers and body go out in separate writes; without this a small body
+    # sits in Nagle's buffer until the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+    server_version = "FunStore"
+    table = None                        # FileTable, set by make_server
+    quiet = False
+
+    def do_GET(self):
+        self.serve(body=True)
+
+    def do_HEAD(self):
+        self.serve(body=False)
+
+    def serve(self, body):
+        info = self.table.lookup(urlsplit(self.path).path)
+        if info is None:
+            self.send_error(404)
+            return
+
+        # representation: the .gz sibling when the client takes gzip, but
+        # ranges always refer to the plain bytes
+        rng = self.headers.get("Range")
+        if rng and self.headers.get("If-Range", info.etag) != info.etag:
+            rng = None
+        chosen = info
+        if not rng and info.gz and "gzip" in self.headers.get("Accept-Encoding", ""):
+            chosen = info.gz
+
+        inm = self.headers.get("If-None-Match")
+        if inm and etag_matches(inm, chosen.etag):
+            self.send_response(304)
+            self.common_headers(info, chosen)
+            self.end_headers()
+            return
+
+        start, end = 0, chosen.size - 1
+        if rng:
+            span = parse_range(rng, info.size)
+            if span == "unsatisfiable":
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{info.size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if span:
+                start, end = span
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{info.size}")
+            else:
+                self.send_response(200)
+        else:
+            self.send_response(200)
+        self.common_headers(info, chosen)
+        self.send_header("Content-Type", chosen.type)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        if body:
+            self.send_body(chosen.path, start, end - start + 1)
+
+    def common_headers(self, info, chosen):
+        self.send_header("ETag", chosen.etag)
+        self.send_header("Cache-Control", info.cache)
+        self.send_header("Accept-Ranges", "bytes")
+        if info.gz:
+            self.send_header("Vary", "Accept-Encoding")
+        if chosen is info.gz:
+            self.send_header("Content-Encoding", "gzip")
+
+    def send_body(self, path, offset, count):
+        with open(path, "rb") as f:
+            if hasattr(os, "sendfile"):
+                out = self.connection.fileno()
+                while count > 0:
+                    sent = os.sendfile(out, f.fileno(), offset, count)
+                    if sent == 0:
+                        break
+                    offset += sent
+                    count -= sent
+            else:
+                # no sendfile (Windows): plain reads
+                f.seek(offset)
+                while count > 0:
+                    block = f.read(min(count, 1 << 16))
+                    if not block:
+                        break
+                    self.wfile.write(block)
+                    count -= len(block)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+def make_server(root, port=PORT, quiet=False):
+    handler = type("StoreHandler", (Handler,), {"table": FileTable(root), "quiet": quiet})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    return server
+
+# --- Benchmark ---
+def evict(path):
+    # drop a file from the OS page cache, where the platform allows it
+    if hasattr(os, "posix_fadvise"):
+        with open(path, "rb") as f:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+def load(port, path, headers, seconds, clients, before=None):
+    # `clients` keep-alive connections hammering one URL; returns (count, latencies)
+    latencies = []
+    lock = threading.Lock()
+    stop = time.perf_counter() + seconds
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        mine = []
+        while time.perf_counter() < stop:
+            if before:
+                before()
+            t = time.perf_counter()
+            conn.request("GET", path, headers=headers)
+            r = conn.getresponse()
+            r.read()
+            mine.append(time.perf_counter() - t)
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return len(latencies), sorted(latencies)
+
+def run_benchmark(root, seconds=2.0, clients=4):
+    server = make_server(root, 0, quiet=True)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    table = server.RequestHandlerClass.table
+
+    # the smallest and biggest files, plus index.html
+    files = sorted((os.path.getsize(os.path.join(table.root, f)), f) for f in os.listdir(table.root)
+                   if os.path.isfile(os.path.join(table.root, f)) and not f.endswith((".gz", ".tmp")))
+    small, big = "/index.html", "/" + files[-1][1]
+    big_info = table.lookup(big)
+    cases = [
+        ("hot   " + small, small, {}, None),
+        ("hot   " + small + " gzip", small, {"Accept-Encoding": "gzip"}, None),
+        ("304   " + small, small, {"If-None-Match": table.lookup(small).etag}, None),
+        ("hot   " + big, big, {}, None),
+        ("range " + big + " 64K", big, {"Range": "bytes=0-65535"}, None),
+        # cold: evicted from the page cache and forgotten by the server first
+        ("cold  " + big, big, {}, lambda: (evict(big_info.path), table.forget(big))),
+    ]
+    print(f"{clients} keep-alive clients, {seconds:.0f}s per case, serving {table.root}")
+    print(f"{'case':<44} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, path, headers, before in cases:
+        count, lat = load(port, path, headers, seconds, clients, before)
+        print(f"{name:<44} {count / seconds:8.0f} {lat[len(lat) // 2] * 1000:8.2f} "
+              f"{lat[min(len(lat) - 1, int(len(lat) * 0.99))] * 1000:8.2f}")
+    server.shutdown()
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    port = int(sys.argv[sys.argv.index("--port") + 1]) if "--port" in sys.argv else PORT
+    if "--port" in sys.argv:
+        args.remove(str(port))
+    root = args[0] if args else os.path.join(HERE, "site")
+    if not os.path.isdir(root):
+        sys.exit(f"{root} does not exist; run python build.py first")
+    if "--bench" in sys.argv:
+        run_benchmark(root)
+        sys.exit()
+    server = make_server(root, port)
+    print(f"serving {os.path.realpath(root)} on http://127.0.0.1:{port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,820 @@
+import random
+import sys
+import time
+from collections import deque
+
+from gameruntime import run_tk
+
+# Constants
+WIDTH = 400
+HEIGHT = 400
+SEG_SIZE = 20
+COLS = WIDTH // SEG_SIZE
+ROWS = HEIGHT // SEG_SIZE
+
+DIRECTIONS = {"Right": (1, 0), "Left": (-1, 0), "Up": (0, -1), "Down": (0, 1)}
+OPPOSITE = {"Right": "Left", "Left": "Right", "Up": "Down", "Down": "Up"}
+
+# Input and speed
+MAX_QUEUED_TURNS = 3      # key presses buffered ahead of the snake, one applied per tick
+BASE_TICK = 100           # ms per step at the start
+MIN_TICK = 45             # fastest the game gets
+TICK_STEP = 3             # ms shaved off per food eaten
+
+# Arena mode: many AI snakes on one big grid, drawn as one image
+ARENA_COLS = 400
+ARENA_ROWS = 300
+ARENA_SCALE = 2           # screen pixels per cell
+ARENA_SNAKES = 300
+ARENA_FOOD = 600          # food kept on the grid
+ARENA_TICK = 1 / 20       # seconds per arena move
+ARENA_START_LENGTH = 4
+TURN_CHANCE = 0.08        # how often an AI snake turns for no reason
+
+class FreeCells:
+    """Grid cells not covered by the snake, with O(1) add, remove and random pick.
+
+    Cells are stored as flat ids (y * cols + x) in a dense list; `slot` maps each
+    id to its position, so a removal swaps the last id into the hole. Picking a
+    food cell stays constant-time even when the snake fills almost the whole grid.
+    """
+
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.ids = list(range(cols * rows))
+        self.slot = list(range(cols * rows))   # -1 while the cell is occupied
+
+    def __len__(self):
+        return len(self.ids)
+
+    def remove(self, cell):
+        x, y = cell
+        i = y * self.cols + x
+        hole = self.slot[i]
+        if hole < 0:
+            return
+        last = self.ids.pop()
+        if last != i:
+            self.ids[hole] = last
+            self.slot[last] = hole
+        self.slot[i] = -1
+
+    def add(self, cell):
+        x, y = cell
+        i = y * self.cols + x
+        if self.slot[i] >= 0:
+            return
+        self.slot[i] = len(self.ids)
+        self.ids.append(i)
+
+    def sample(self, rng=random):
+        return divmod(rng.choice(self.ids), self.cols)[::-1]
+
+# --- Headless engine ---
+class SnakeEngine:
+    """One game of Snake with no Tk: the grid model, the rules and the score.
+
+    The body is a deque of grid cells, head first, plus a set of occupied cells,
+    so every collision check is O(1). After each step `grew` and `last_tail`
+    tell a view what changed.
+    """
+
+    def __init__(self, cols=COLS, rows=ROWS, seed=None):
+        self.cols = cols
+        self.rows = rows
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        start = (1, 1)
+        self.cells = deque([start])
+        self.occupied = {start}
+        self.free = FreeCells(self.cols, self.rows)
+        self.free.remove(start)
+        self.direction = "Right"
+        self.turns = deque()
+        self.alive = True
+        self.won = False
+        self.score = 0
+        self.steps = 0
+        self.grew = False
+        self.last_tail = None
+        self.food = None
+        self.place_food()
+
+    def place_food(self):
+        # only ever on a cell the snake doesn't cover; None once the board is full
+        self.food = self.free.sample(self.rng) if self.free else None
+
+    def change_direction(self, new_direction):
+        if self.direction != OPPOSITE[new_direction]:
+            self.direction = new_direction
+
+    def queue_turn(self, new_direction):
+        # Buffer a turn for a later step. Checked against the last queued turn,
+        # so Up then Left inside one tick both land instead of the first being lost.
+        last = self.turns[-1] if self.turns else self.direction
+        if new_direction in (last, OPPOSITE[last]) or len(self.turns) >= MAX_QUEUED_TURNS:
+            return False
+        self.turns.append(new_direction)
+        return True
+
+    def tick_ms(self):
+        # speed curve: a little faster per food eaten, down to MIN_TICK
+        return max(MIN_TICK, BASE_TICK - TICK_STEP * self.score)
+
+    def next_head(self):
+        x, y = self.cells[0]
+        dx, dy = DIRECTIONS[self.direction]
+        return (x + dx, y + dy)
+
+    def check_collision(self, head):
+        # What the head would hit at `head`: "wall", "self", "food" or None.
+        x, y = head
+        if x < 0 or y < 0 or x >= self.cols or y >= self.rows:
+            return "wall"
+        # the tail cell frees up this tick, so moving into it is allowed
+        if head in self.occupied and head != self.cells[-1]:
+            return "self"
+        if head == self.food:
+            return "food"
+        return None
+
+    def step(self):
+        # Advance one cell. Returns what the head hit ("wall", "self", "food" or None).
+        if not self.alive:
+            return None
+        if self.turns:
+            self.change_direction(self.turns.popleft())
+        head = self.next_head()
+        hit = self.check_collision(head)
+        self.steps += 1
+        if hit in ("wall", "self"):
+            self.alive = False
+            return hit
+        self.grew = hit == "food"
+        self.last_tail = None
+        if not self.grew:
+            self.last_tail = self.cells.pop()
+            self.occupied.discard(self.last_tail)
+            self.free.add(self.last_tail)
+        self.cells.appendleft(head)
+        self.occupied.add(head)
+        self.free.remove(head)
+        if self.grew:
+            self.score += 1
+            self.place_food()
+            if self.food is None:
+                self.alive = False
+                self.won = True
+        return hit
+
+# --- Batched headless games (NumPy) ---
+# direction codes for SnakeBatch; opposite of d is (d + 2) % 4
+BATCH_DIRECTIONS = ("Right", "Down", "Left", "Up")
+
+class SnakeBatch:
+    """N independent headless games stepped together on NumPy arrays.
+
+    Per game: a ring buffer of body cell ids (head at `head_ptr`), its length,
+    an occupancy grid, the direction code and the food cell id. `step(actions)`
+    takes one direction code per game, returns (reward, done) and resets the
+    games that ended; `observe()` gives an (n, rows, cols) int8 grid with
+    0 empty, 1 body, 2 head, 3 food. Needs NumPy; the Tk game does not.
+    """
+
+    def __init__(self, n, cols=COLS, rows=ROWS, seed=None):
+        import numpy as np
+        self.np = np
+        self.n = n
+        self.cols = cols
+        self.rows = rows
+        self.cells = cols * rows
+        self.rng = np.random.default_rng(seed)
+        self.index = np.arange(n)
+        self.dx = np.array([1, 0, -1, 0])
+        self.dy = np.array([0, 1, 0, -1])
+        self.body = np.zeros((n, self.cells), np.int32)
+        self.head_ptr = np.zeros(n, np.int64)
+        self.length = np.ones(n, np.int64)
+        self.occupied = np.zeros((n, self.cells), np.bool_)
+        self.direction = np.zeros(n, np.int64)
+        self.food = np.zeros(n, np.int64)
+        self.reset()
+
+    def reset(self, mask=None):
+        np = self.np
+        idx = self.index if mask is None else np.flatnonzero(mask)
+        start = 1 * self.cols + 1
+        self.occupied[idx] = False
+        self.occupied[idx, start] = True
+        self.body[idx, 0] = start
+        self.head_ptr[idx] = 0
+        self.length[idx] = 1
+        self.direction[idx] = 0
+        self.place_food(idx)
+        return self.observe()
+
+    def place_food(self, idx):
+        # A few rounds of vectorised rejection sampling, then an exact pick among
+        # the free cells for whatever is left (only nearly full boards get there).
+        # Returns the games whose board is full.
+        np = self.np
+        todo = idx
+        for _ in range(4):
+            if not len(todo):
+                return todo
+            cand = self.rng.integers(0, self.cells, len(todo))
+            ok = ~self.occupied[todo, cand]
+            self.food[todo[ok]] = cand[ok]
+            todo = todo[~ok]
+        if not len(todo):
+            return todo
+        free = ~self.occupied[todo]
+        self.food[todo] = np.argmax(self.rng.random(free.shape) * free, axis=1)
+        return todo[~free.any(axis=1)]
+
+    def step(self, actions):
+        np = self.np
+        ar = self.index
+        actions = np.asarray(actions, np.int64)
+        # a turn straight back into the neck is ignored, as in the Tk game
+        back = (actions - self.direction) % 4 == 2
+        self.direction = np.where(back, self.direction, actions)
+        head = self.body[ar, self.head_ptr]
+        x = head % self.cols + self.dx[self.direction]
+        y = head // self.cols + self.dy[self.direction]
+        wall = (x < 0) | (x >= self.cols) | (y < 0) | (y >= self.rows)
+        new = np.where(wall, 0, y * self.cols + x)
+        eat = (new == self.food) & ~wall
+        # free the tail first for snakes that don't grow, so moving into it is legal
+        moving = ar[~wall & ~eat]
+        tail = self.body[moving, (self.head_ptr[moving] - self.length[moving] + 1) % self.cells]
+        self.occupied[moving, tail] = False
+        dead = wall | (self.occupied[ar, new] & ~wall)
+        live = ar[~dead]
+        self.head_ptr[live] = (self.head_ptr[live] + 1) % self.cells
+        self.body[live, self.head_ptr[live]] = new[live]
+        self.occupied[live, new[live]] = True
+        self.length += eat
+        full = self.place_food(np.flatnonzero(eat))
+        reward = eat.astype(np.float32) - dead
+        done = dead.copy()
+        done[full] = True
+        if done.any():
+            self.reset(done)
+        return reward, done
+
+    def observe(self):
+        ar = self.index
+        grid = self.occupied.astype(self.np.int8)
+        grid[ar, self.body[ar, self.head_ptr]] = 2
+        grid[ar, self.food] = 3
+        return grid.reshape(self.n, self.rows, self.cols)
+
+def run_benchmark(n=4096, seconds=2.0):
+    import numpy as np
+    batch = SnakeBatch(n, seed=0)
+    rng = np.random.default_rng(1)
+    actions = rng.integers(0, 4, (64, n))
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for a in actions:
+            batch.step(a)
+        steps += len(actions) * n
+    batched = steps / (time.perf_counter() - start)
+
+    engine = SnakeEngine(seed=0)
+    names = list(DIRECTIONS)
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for _ in range(1000):
+            engine.change_direction(names[engine.rng.randrange(4)])
+            engine.step()
+            if not engine.alive:
+                engine.reset()
+        steps += 1000
+    single = steps / (time.perf_counter() - start)
+    print(f"SnakeBatch x{n}: {batched:,.0f} steps/s")
+    print(f"SnakeEngine:     {single:,.0f} steps/s")
+
+# --- Autopilot ---
+class Autopilot:
+    """Steers a SnakeEngine: BFS to the food, but only along a route that
+    leaves the head a way back onto its own trail, so it doesn't box itself in.
+
+    Cells are flat ids (y * cols + x). The searches are time-aware: body
+    segment i (head is 0) is gone after len - i moves, so a route may cross
+    the back of the body if it gets there late enough. A checked route is
+    kept and walked step by step; the autopilot only searches again once the
+    food has been eaten, the route runs out or the head is not where the
+    route expects it (something else steered the snake).
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.cols = engine.cols
+        self.size = engine.cols * engine.rows
+        self.path = []             # planned cells still to walk, next one last
+        self.target = None         # food the plan leads to
+        self.plans = 0
+        self.plan_time = 0.0
+        self.moves = 0
+        self.neighbors = [self.cell_neighbors(i) for i in range(self.size)]
+
+    def cell_neighbors(self, i):
+        cols = self.cols
+        x = i % cols
+        out = []
+        if x + 1 < cols:
+            out.append(i + 1)
+        if x > 0:
+            out.append(i - 1)
+        if i + cols < self.size:
+            out.append(i + cols)
+        if i >= cols:
+            out.append(i - cols)
+        return tuple(out)
+
+    def bfs(self, body, goal, back=None):
+        # Shortest route from body[0] to goal; returns the cells reversed
+        # (goal first, next step last) or None. `back` is the cell the head
+        # came from: the engine ignores a turn straight back, so the first
+        # step can't go there.
+        if len(body) > 1:
+            back = body[1]
+        free_at = dict(zip(body, range(len(body), 0, -1)))
+        neighbors = self.neighbors
+        parent = {body[0]: None}
+        frontier = [body[0]]
+        t = 1
+        while frontier:
+            nxt = []
+            for cell in frontier:
+                for nb in neighbors[cell]:
+                    if nb in parent or free_at.get(nb, 0) > t or (t == 1 and nb == back):
+                        continue
+                    parent[nb] = cell
+                    if nb == goal:
+                        return self.route(parent, nb, body[0])
+                    nxt.append(nb)
+            frontier = nxt
+            t += 1
+        return None
+
+    def escape(self, body, avoid=None):
+        # Shortest route over empty cells onto any body cell the moment it is
+        # vacated. From there the head can trail its own tail indefinitely, so
+        # a body that has one can't be trapped (barring food spawning in the way).
+        # `avoid` (the food) is stepped around: eating it would stretch the
+        # body and put the timing off by one.
+        free_at = dict(zip(body, range(len(body), 0, -1)))
+        neighbors = self.neighbors
+        back = body[1]
+        parent = {body[0]: None, avoid: None}
+        frontier = [body[0]]
+        t = 1
+        while frontier:
+            nxt = []
+            for cell in frontier:
+                for nb in neighbors[cell]:
+                    if nb in parent or (t == 1 and nb == back):
+                        continue
+                    when = free_at.get(nb)
+                    if when is None:
+                        parent[nb] = cell
+                        nxt.append(nb)
+                    elif when <= t:
+                        parent[nb] = cell
+                        return self.route(parent, nb, body[0])
+            frontier = nxt
+            t += 1
+        return None
+
+    def route(self, parent, cell, start):
+        path = []
+        while cell != start:
+            path.append(cell)
+            cell = parent[cell]
+        return path
+
+    def tail_reachable(self, body):
+        return len(body) < 2 or self.escape(body) is not None
+
+    def after(self, body, path, grow):
+        # body once the snake has walked `path` (reversed, as bfs returns it)
+        return (path + body)[:len(body) + grow]
+
+    def plan(self, body, back):
+        food = self.engine.food
+        self.path = []
+        self.target = food
+        if food is None:
+            return
+        path = self.bfs(body, food[1] * self.cols + food[0], back)
+        if path and self.tail_reachable(self.after(body, path, 1)):
+            self.path = path
+
+    def wander(self, body, back):
+        # No safe route to the food: stall by taking the step whose escape
+        # route is longest, which uncoils the body and opens space. That route
+        # is walkable as planned, so it becomes the plan until it runs out.
+        food = self.engine.food
+        food = food and food[1] * self.cols + food[0]
+        best, best_key, best_route = None, None, None
+        blocked = set(body[:-1])
+        blocked.add(back)
+        for nb in self.neighbors[body[0]]:
+            if nb in blocked:
+                continue
+            moved = self.after(body, [nb], nb == food)
+            if len(moved) < 2:
+                return nb
+            route = self.escape(moved, food)
+            key = -1 if route is None else len(route)
+            if best is None or key > best_key:
+                best, best_key, best_route = nb, key, route
+        self.path = best_route or []
+        return best
+
+    def next_direction(self):
+        engine = self.engine
+        start = time.perf_counter()
+        cols = self.cols
+        x, y = engine.cells[0]
+        head = y * cols + x
+        dx, dy = DIRECTIONS[engine.direction]
+        back = head - dx - dy * cols
+        planned = self.path[-1] if self.path else None
+        if engine.food == self.target and planned in self.neighbors[head] and planned != back:
+            # still on a plan that was checked when it was made; the snake moves
+            # deterministically along it, so there is nothing to re-verify
+            nxt = self.path.pop()
+        else:
+            body = [y * cols + x for x, y in engine.cells]
+            self.plans += 1
+            self.plan(body, back)
+            nxt = self.path.pop() if self.path else self.wander(body, back)
+        self.plan_time += time.perf_counter() - start
+        self.moves += 1
+        if nxt is None:
+            return engine.direction
+        delta = nxt - head
+        if delta == 1:
+            return "Right"
+        if delta == -1:
+            return "Left"
+        return "Down" if delta == cols else "Up"
+
+def run_autopilot(cols=COLS, rows=ROWS, games=20, seed=0):
+    # Headless stress run: the autopilot plays `games` games to the end, or until
+    # it goes a full board's worth of moves twice over without eating.
+    lengths = []
+    plan_time = moves = 0
+    start = time.perf_counter()
+    for g in range(games):
+        engine = SnakeEngine(cols, rows, seed=seed + g)
+        pilot = Autopilot(engine)
+        hungry = 0
+        while engine.alive and hungry < 2 * cols * rows:
+            engine.change_direction(pilot.next_direction())
+            hungry = 0 if engine.step() == "food" else hungry + 1
+        lengths.append(len(engine.cells))
+        plan_time += pilot.plan_time
+        moves += pilot.moves
+    elapsed = time.perf_counter() - start
+    print(f"{games} games on {cols}x{rows}: avg length {sum(lengths) / games:.1f} "
+          f"(max {max(lengths)}, full board {cols * rows})")
+    print(f"planning {plan_time / moves * 1e6:.1f} us/move, {moves / elapsed:,.0f} moves/s")
+
+# --- Arena: many AI snakes on one shared grid ---
+# grid cell values; anything >= WALL kills a head that moves in
+EMPTY, FOOD, WALL = 0, 1, 2
+BODY_COLORS = ("#4CAF50", "#2196F3", "#FFEB3B", "#E91E63", "#00BCD4", "#FF9800", "#9C27B0", "#CDDC39")
+CELL_COLORS = ("#000000", "#FF1744", "#606060") + BODY_COLORS
+
+class ArenaSnake:
+    __slots__ = ("body", "direction", "grow", "code")
+
+    def __init__(self, code):
+        self.body = deque()     # flat cell ids, head first
+        self.direction = 0      # index into Arena.deltas
+        self.grow = 0           # moves left that don't give up the tail
+        self.code = code        # grid value of its body, which picks its colour
+
+class Arena:
+    """Hundreds of AI snakes and plenty of food on one occupancy grid.
+
+    The grid is a bytearray with a wall border, one byte per cell: EMPTY,
+    FOOD, WALL or a snake's colour code, so a single lookup tells a head
+    what it moved into, with no bounds checks. A tick first steers every
+    snake and lifts the tails of those not growing. Then one pass over the
+    snakes writes each new head into the grid; a head that finds anything
+    solid there dies, and so does the second of two heads reaching the same
+    cell. Dead snakes turn into food and respawn somewhere empty, so the
+    snake count stays put.
+    """
+
+    def __init__(self, cols=ARENA_COLS, rows=ARENA_ROWS, snakes=ARENA_SNAKES, food=ARENA_FOOD, seed=None):
+        self.cols, self.rows = cols, rows
+        self.width = cols + 2                  # with the border
+        self.grid = bytearray(self.width * (rows + 2))
+        w = self.width
+        self.grid[:w] = self.grid[-w:] = bytes([WALL]) * w
+        self.grid[w - 1::w] = self.grid[0::w] = bytes([WALL]) * (rows + 2)
+        self.deltas = (1, w, -1, -w)           # right, down, left, up; turns are +-1 mod 4
+        self.rng = random.Random(seed)
+        self.food_target = food
+        self.food = 0
+        self.ticks = 0
+        self.deaths = 0
+        self.snakes = [ArenaSnake(WALL + 1 + i % len(BODY_COLORS)) for i in range(snakes)]
+        for snake in self.snakes:
+            self.spawn(snake)
+        self.add_food()
+
+    def random_empty(self):
+        # a random empty cell; the grid is mostly empty, so a few tries do
+        grid, rng, w = self.grid, self.rng, self.width
+        while True:
+            i = (rng.randrange(self.rows) + 1) * w + rng.randrange(self.cols) + 1
+            if grid[i] == EMPTY:
+                return i
+
+    def spawn(self, snake):
+        i = self.random_empty()
+        snake.body.clear()
+        snake.body.append(i)
+        snake.direction = self.rng.randrange(4)
+        snake.grow = ARENA_START_LENGTH - 1
+        self.grid[i] = snake.code
+
+    def add_food(self):
+        while self.food < self.food_target:
+            self.grid[self.random_empty()] = FOOD
+            self.food += 1
+
+    def steer(self, snake, head):
+        # food next to the head wins; otherwise straight on, with the odd
+        # random turn, and away from anything solid
+        grid, deltas = self.grid, self.deltas
+        d = snake.direction
+        ahead = grid[head + deltas[d]]
+        if ahead == FOOD:
+            return d
+        left, right = (d + 3) & 3, (d + 1) & 3
+        on_left, on_right = grid[head + deltas[left]], grid[head + deltas[right]]
+        if on_left == FOOD:
+            return left
+        if on_right == FOOD:
+            return right
+        if ahead < WALL and self.rng.random() >= TURN_CHANCE:
+            return d
+        options = [t for t, v in ((left, on_left), (right, on_right)) if v < WALL]
+        if ahead < WALL:
+            options.append(d)
+        return self.rng.choice(options) if options else d
+
+    def tick(self):
+        grid, deltas = self.grid, self.deltas
+        moves = []
+        # steer, and lift the tails of the snakes that aren't growing, so a
+        # head may follow a tail (its own or another's) into its cell
+        for snake in self.snakes:
+            body = snake.body
+            head = body[0]
+            snake.direction = d = self.steer(snake, head)
+            new = head + deltas[d]
+            if grid[new] == FOOD:
+                pass                    # eating: the tail stays
+            elif snake.grow:
+                snake.grow -= 1
+            else:
+                grid[body.pop()] = EMPTY
+            moves.append((snake, new))
+
+        # the collision pass: each head claims its cell or dies there
+        dead = []
+        for snake, new in moves:
+            hit = grid[new]
+            if hit >= WALL:
+                dead.append(snake)
+                continue
+            if hit == FOOD:
+                self.food -= 1
+            grid[new] = snake.code
+            snake.body.appendleft(new)
+
+        for snake in dead:
+            # every other segment of the body is left behind as food
+            for n, i in enumerate(snake.body):
+                if n % 2 == 0:
+                    grid[i] = FOOD
+                    self.food += 1
+                else:
+                    grid[i] = EMPTY
+            self.spawn(snake)
+        self.deaths += len(dead)
+        self.add_food()
+        self.ticks += 1
+
+def color_tables(colors):
+    # (red, green, blue) bytes.translate tables for grid cell values
+    tables = [bytearray(256) for _ in range(3)]
+    for value, color in enumerate(colors):
+        for channel in range(3):
+            tables[channel][value] = int(color[1 + 2 * channel:3 + 2 * channel], 16)
+    return [bytes(t) for t in tables]
+
+def render_ppm(grid, width, height, scale, tables):
+    """The grid (width x height cells) as a binary PPM, `scale` pixels per cell.
+
+    All byte work happens in C: each colour channel is one translate() of the
+    grid written into every third byte, then pixels are widened with strided
+    slice assignment and rows repeated. Colouring before scaling touches
+    scale^2 fewer bytes.
+    """
+    rgb = bytearray(3 * len(grid))
+    for channel, table in enumerate(tables):
+        rgb[channel::3] = grid.translate(table)
+    if scale > 1:
+        wide = bytearray(len(rgb) * scale)
+        step = 3 * scale
+        for k in range(scale):
+            for channel in range(3):
+                wide[3 * k + channel::step] = rgb[channel::3]
+        row = 3 * width * scale
+        rgb = b"".join(wide[i:i + row] * scale for i in range(0, len(wide), row))
+    return b"P6 %d %d 255\n" % (width * scale, height * scale) + rgb
+
+def run_arena_benchmark(counts=(50, 100, 200, 400, 800, 1600), cols=500, rows=500, seconds=1.0):
+    # Headless: ticks/s as the snake count grows on one big grid, and what
+    # building a frame (the PPM for the image) costs on top
+    tables = color_tables(CELL_COLORS)
+    print(f"{cols}x{rows} arena, food {ARENA_FOOD * 4}")
+    for n in counts:
+        arena = Arena(cols, rows, n, ARENA_FOOD * 4, seed=0)
+        ticks = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            for _ in range(10):
+                arena.tick()
+            ticks += 10
+        elapsed = time.perf_counter() - start
+        length = sum(len(s.body) for s in arena.snakes) / n
+        start = time.perf_counter()
+        render_ppm(arena.grid, arena.width, rows + 2, 1, tables)
+        frame = time.perf_counter() - start
+        print(f"{n:5d} snakes: {ticks / elapsed:8,.0f} ticks/s, {elapsed / ticks / n * 1e6:5.2f} us/snake, "
+              f"avg length {length:5.1f}, {arena.deaths / ticks:5.2f} deaths/tick, frame {frame * 1000:.1f} ms")
+
+# --- Tk game ---
+def cell_rect(cell):
+    x, y = cell
+    return (x * SEG_SIZE, y * SEG_SIZE, (x + 1) * SEG_SIZE, (y + 1) * SEG_SIZE)
+
+class SnakeGame:
+    # one update per move, scheduled by the runtime at the current tick_ms(),
+    # so moves land on the speed curve instead of a 16 ms frame grid
+    paced = True
+
+    def __init__(self, backend):
+        self.backend = backend
+        backend.title("Snake Game")
+        self.canvas = backend.widget("Canvas", width=WIDTH, height=HEIGHT, bg="black")
+        self.canvas.pack()
+
+        self.engine = SnakeEngine()
+        # The canvas only mirrors the engine, one rectangle per segment in body
+        # order. A tick moves the tail's item to the new head (one coords() call);
+        # only growth creates an item.
+        self.items = deque(self.canvas.create_rectangle(cell_rect(c), fill="green") for c in self.engine.cells)
+        self.food_item = self.canvas.create_rectangle(cell_rect(self.engine.food), fill="red")
+
+        # time until the next title update
+        self.report_in = 1.0
+
+        self.pilot = None          # Autopilot while "a" has it switched on
+
+        backend.bind("<KeyPress>", "key")
+
+    @property
+    def step(self):
+        return self.engine.tick_ms() / 1000
+
+    def update(self, dt):
+        for name, event in self.backend.inputs.drain():
+            self.on_key_press(event)
+        if not self.engine.alive:
+            return
+        self.report_in -= dt
+        if self.report_in <= 0:
+            self.report_in = 1.0
+            self.report_jitter()
+        self.tick()
+
+    def tick(self):
+        engine = self.engine
+        if self.pilot:
+            engine.change_direction(self.pilot.next_direction())
+        hit = engine.step()
+        if engine.alive or engine.won:
+            self.mirror_move()
+        if hit == "food" and engine.food:
+            self.canvas.coords(self.food_item, cell_rect(engine.food))
+        if engine.won:
+            self.canvas.create_text(WIDTH / 2, HEIGHT / 2, text="YOU WIN", fill="green", font=("Arial", 24))
+        elif not engine.alive:
+            self.canvas.create_text(WIDTH / 2, HEIGHT / 2, text="GAME OVER", fill="red", font=("Arial", 24))
+
+    def draw(self, alpha):
+        # every change is mirrored onto the canvas as it happens in tick()
+        pass
+
+    def counts(self):
+        # (entities, canvas items) for frame telemetry: segments and food
+        return len(self.engine.cells) + 1, len(self.items) + 1
+
+    def mirror_move(self):
+        head = self.engine.cells[0]
+        if self.engine.grew:
+            item = self.canvas.create_rectangle(cell_rect(head), fill="green")
+        else:
+            item = self.items.pop()
+            self.canvas.coords(item, cell_rect(head))
+        self.items.appendleft(item)
+
+    def report_jitter(self):
+        # the move interval and how late moves fire (a paced game's frames
+        # are its moves), in the title
+        avg, p95, worst = self.backend.frame_stats()
+        self.backend.title(f"Snake Game - {self.engine.tick_ms()} ms/tick, "
+                           f"late avg {avg:.1f} ms, p95 {p95:.1f} ms, max {worst:.1f} ms")
+
+    def on_key_press(self, event):
+        direction = event.keysym
+        if direction in ["Up", "Down", "Left", "Right"]:
+            # the autopilot steers alone; a queued turn would override it
+            if not self.pilot:
+                self.engine.queue_turn(direction)
+        elif direction == "a":
+            self.engine.turns.clear()
+            self.pilot = None if self.pilot else Autopilot(self.engine)
+
+class ArenaGame:
+    """Arena mode in Tk: the whole grid is one PhotoImage on the canvas,
+    rebuilt from the grid bytes after each arena tick, however many snakes
+    there are."""
+
+    step = ARENA_TICK
+
+    def __init__(self, backend, cols=ARENA_COLS, rows=ARENA_ROWS, snakes=ARENA_SNAKES, seed=None):
+        self.backend = backend
+        backend.title(f"Snake Arena - {snakes} snakes")
+        self.arena = Arena(cols, rows, snakes, seed=seed)
+        self.size = (self.arena.width, rows + 2)
+        w, h = self.size[0] * ARENA_SCALE, self.size[1] * ARENA_SCALE
+        self.canvas = backend.widget("Canvas", width=w, height=h, bg="black", highlightthickness=0)
+        self.canvas.pack()
+        self.tables = color_tables(CELL_COLORS)
+        self.image = backend.image(w, h)
+        self.canvas.create_image(0, 0, image=self.image, anchor="nw")
+        self.dirty = True
+
+    def update(self, dt):
+        # nothing to steer here; drop whatever was queued so the queue never fills
+        self.backend.inputs.clear()
+        self.arena.tick()
+        self.dirty = True
+
+    def draw(self, alpha):
+        # the grid moves in whole cells, so there is nothing to interpolate;
+        # just redraw once per tick
+        if self.dirty:
+            self.dirty = False
+            self.image.configure(data=render_ppm(self.arena.grid, *self.size, ARENA_SCALE, self.tables),
+                                 format="PPM")
+
+    def counts(self):
+        # (entities, canvas items) for frame telemetry
+        return len(self.arena.snakes) + self.arena.food, 1
+
+
+# Main program
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        run_benchmark()
+        sys.exit()
+    if "--arena-bench" in sys.argv:
+        run_arena_benchmark()
+        sys.exit()
+    if "--arena" in sys.argv:
+        run_tk(ArenaGame)
+        sys.exit()
+    if "--autopilot" in sys.argv:
+        # --autopilot [cols rows games]
+        run_autopilot(*map(int, sys.argv[sys.argv.index("--autopilot") + 1:]))
+        sys.exit()
+    run_tk(SnakeGame)
@@ -1,182 +1,543 @@
-import tkinter as tk
+import math
 import random
+import sys
+import time
+
+from gameruntime import NullBackend, run_tk
+
+WIDTH = 600
+HEIGHT = 600
+
+# Timing: the runtime advances the simulation in fixed STEPs and draws frames
+# that interpolate between the last two steps. Speeds are per second.
+STEP = 1 / 60
+INVADER_SPEED = 40          # px/s sideways
+INVADER_DROP = 20           # px down at each edge
+PLAYER_BULLET_SPEED = 200
+INVADER_BULLET_SPEED = 140
+FIRE_RATE = 0.05            # enemy shots per second per column
+
+# Bullet pools: items created up front, and the most bullets alive at once
+PLAYER_POOL_SIZE = 16
+MAX_PLAYER_BULLETS = 24
+INVADER_POOL_SIZE = 8
+MAX_INVADER_BULLETS = 16
+
+# Barricades: per-pixel masks, and the crater a bullet blows out of one as
+# (dx, dy, distance squared); the inner disc always goes, the rim sometimes
+BARRICADE_W = 50
+BARRICADE_H = 20
+BARRICADE_Y = 480           # top edge; all three sit in one band
+CRATER = [(dx, dy, dx * dx + dy * dy) for dy in range(-3, 4) for dx in range(-3, 4)
+          if dx * dx + dy * dy <= 10]
+CRATER_CORE = 4
+CRATER_RIM_CHANCE = 0.6
+
+class Entity:
+    """Anything on the field: its box lives here, the canvas item only mirrors it."""
+    __slots__ = ("x1", "y1", "x2", "y2", "px", "py", "item", "alive")
+
+    def __init__(self, x1, y1, x2, y2, item=None):
+        self.x1, self.y1, self.x2, self.y2 = x1, y1, x2, y2
+        self.px, self.py = x1, y1     # top-left as of the previous step, for drawing
+        self.item = item
+        self.alive = True
+
+    def remember(self):
+        self.px, self.py = self.x1, self.y1
+
+    def move(self, dx, dy):
+        self.x1 += dx
+        self.x2 += dx
+        self.y1 += dy
+        self.y2 += dy
+
+    def overlaps(self, other):
+        return self.x1 < other.x2 and self.x2 > other.x1 and self.y1 < other.y2 and self.y2 > other.y1
+
+class Barricade(Entity):
+    """A shield as a per-pixel mask, one byte per pixel, 1 while solid.
+
+    A bullet is tested against the mask rows its leading edge swept during
+    the step, so each pixel on its path is looked at once, and a hit carves
+    a crater out of it. On the canvas it is one PhotoImage; a crater only
+    makes the pixels it cleared transparent.
+    """
+    __slots__ = ("w", "h", "mask", "image")
+
+    def __init__(self, x, y, w, h, image, item=None):
+        super().__init__(x, y, x + w, y + h, item)
+        self.w, self.h = w, h
+        self.mask = bytearray(b"\1") * (w * h)
+        self.image = image
+
+    def impact(self, e, upward):
+        # (x, y) in the mask of the first solid pixel e's leading edge ran
+        # into this step (its top edge if `upward`, else its bottom), or None
+        w = self.w
+        c0 = max(0, int(e.x1 - self.x1))
+        c1 = min(w, math.ceil(e.x2 - self.x1))
+        if upward:
+            top, bottom = e.y1, e.py + 1
+        else:
+            top, bottom = e.py + (e.y2 - e.y1) - 1, e.y2
+        r0 = max(0, int(top - self.y1))
+        r1 = min(self.h, math.ceil(bottom - self.y1))
+        if c0 >= c1:
+            return None
+        find = self.mask.find
+        for r in (range(r1 - 1, r0 - 1, -1) if upward else range(r0, r1)):
+            i = find(1, r * w + c0, r * w + c1)
+            if i >= 0:
+                return (i - r * w, r)
+        return None
+
+    def carve(self, cx, cy):
+        # knock a ragged crater out around (cx, cy); returns the pixels cleared
+        w, h, mask = self.w, self.h, self.mask
+        cleared = []
+        for dx, dy, d2 in CRATER:
+            x, y = cx + dx, cy + dy
+            if 0 <= x < w and 0 <= y < h and mask[y * w + x]:
+                if d2 <= CRATER_CORE or random.random() < CRATER_RIM_CHANCE:
+                    mask[y * w + x] = 0
+                    cleared.append((x, y))
+        return cleared
+
+class BulletPool:
+    """Pre-created canvas rectangles that bullets borrow and hand back.
+
+    Free items are hidden rather than deleted, so steady fire costs a coords
+    and a state change instead of a create/delete per shot. Once `cap`
+    bullets are out, acquire() refuses. If the free list runs dry below the
+    cap, a new item is made and kept (a miss).
+    """
+
+    def __init__(self, canvas, fill, size, cap):
+        self.canvas = canvas
+        self.fill = fill
+        self.cap = cap
+        self.free = [self.new_item() for _ in range(size)]
+        self.live = 0
+        self.peak = 0
+        self.hits = 0
+        self.misses = 0
+        self.refused = 0
+
+    def new_item(self):
+        return self.canvas.create_rectangle(0, 0, 0, 0, fill=self.fill, state="hidden")
+
+    def acquire(self, x1, y1, x2, y2):
+        if self.live >= self.cap:
+            self.refused += 1
+            return None
+        if self.free:
+            item = self.free.pop()
+            self.hits += 1
+        else:
+            item = self.new_item()
+            self.misses += 1
+        self.canvas.coords(item, x1, y1, x2, y2)
+        self.canvas.itemconfig(item, state="normal")
+        self.live += 1
+        self.peak = max(self.peak, self.live)
+        return Entity(x1, y1, x2, y2, item)
+
+    def release(self, e):
+        e.alive = False
+        self.canvas.itemconfig(e.item, state="hidden")
+        self.free.append(e.item)
+        self.live -= 1
+
+    def report(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 100.0
+        return (f"{self.fill} bullets: {total} fired, {rate:.0f}% from pool, "
+                f"peak {self.peak}/{self.cap} live, {self.refused} refused")
+
+class Formation:
+    """The invader block as one entity: an origin plus an alive bitmask over a
+    fixed rows x cols layout (bit r * cols + c).
+
+    Per-column row bits and per-row counts keep the bounding box and the
+    bottom-most invader of each column current as invaders die, so nothing
+    has to scan the whole grid.
+    """
+
+    def __init__(self, rows, cols, x, y, step_x=60, step_y=40, w=30, h=20):
+        self.rows, self.cols = rows, cols
+        self.ox, self.oy = x, y
+        self.px, self.py = x, y       # origin as of the previous step
+        self.direction = 1
+        self.step_x, self.step_y = step_x, step_y
+        self.w, self.h = w, h
+        self.alive = (1 << rows * cols) - 1
+        self.col_bits = [(1 << rows) - 1] * cols    # bit r set while (r, c) lives
+        self.row_counts = [cols] * rows
+        self.count = rows * cols
+        self.left, self.right, self.bottom = 0, cols - 1, rows - 1
+        self.items = [None] * (rows * cols)
+
+    def slot_box(self, r, c):
+        x = self.ox + c * self.step_x
+        y = self.oy + r * self.step_y
+        return (x, y, x + self.w, y + self.h)
+
+    def bbox(self):
+        return (self.ox + self.left * self.step_x, self.oy,
+                self.ox + self.right * self.step_x + self.w,
+                self.oy + self.bottom * self.step_y + self.h)
+
+    def move(self, dx, dy):
+        self.ox += dx
+        self.oy += dy
+
+    def remember(self):
+        self.px, self.py = self.ox, self.oy
+
+    def is_alive(self, r, c):
+        return self.alive >> (r * self.cols + c) & 1
+
+    def kill(self, r, c):
+        self.alive &= ~(1 << (r * self.cols + c))
+        self.col_bits[c] &= ~(1 << r)
+        self.row_counts[r] -= 1
+        self.count -= 1
+        if not self.count:
+            return
+        while not self.col_bits[self.left]:
+            self.left += 1
+        while not self.col_bits[self.right]:
+            self.right -= 1
+        while not self.row_counts[self.bottom]:
+            self.bottom -= 1
+
+    def hit(self, e):
+        # (row, col) of a live invader overlapping e, or None; only the slots
+        # under e's box are looked at
+        c0 = max(0, int((e.x1 - self.ox) // self.step_x))
+        c1 = min(self.cols - 1, int((e.x2 - self.ox) // self.step_x))
+        r0 = max(0, int((e.y1 - self.oy) // self.step_y))
+        r1 = min(self.rows - 1, int((e.y2 - self.oy) // self.step_y))
+        for r in range(r0, r1 + 1):
+            for c in range(c0, c1 + 1):
+                if self.is_alive(r, c):
+                    x1, y1, x2, y2 = self.slot_box(r, c)
+                    if e.x1 < x2 and e.x2 > x1 and e.y1 < y2 and e.y2 > y1:
+                        return (r, c)
+        return None
+
+    def shooters(self):
+        # bottom-most live invader of every column that still has one
+        return [(bits.bit_length() - 1, c) for c, bits in enumerate(self.col_bits) if bits]
+
+def wave_formation(rows, cols):
+    # shrink the spacing (and the invaders with it) so any wave fits the screen
+    step_x = min(60, (WIDTH - 100) // cols)
+    step_y = min(40, 320 // rows)
+    return Formation(rows, cols, 50, 50, step_x, step_y, step_x // 2, step_y // 2)
+
+def make_wave(number):
+    # wave 1 is the classic 3 x 8 block; each later one adds rows and columns
+    return wave_formation(min(3 + 2 * (number - 1), 24), min(8 + 4 * (number - 1), 48))
 
 class SpaceInvaders:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Tkinter Space Invaders")
+    step = STEP
 
-        # Canvas
-        self.canvas = tk.Canvas(root, width=600, height=600, bg="black")
-        self.canvas.pack()
-
-        # Player
-        self.player = self.canvas.create_rectangle(290, 560, 310, 580, fill="white")
+    def __init__(self, backend, show_stats=False):
+        # On a NullBackend the game runs headless (see run_benchmark).
+        self.backend = backend
+        self.show_stats = show_stats    # print bullet pool stats at game end (--stats)
 
         # Variables
         self.bullets = []
         self.invader_bullets = []
-        self.invaders = []
+        self.formation = None
         self.barricades = []
         self.score = 0
+        self.wave = 1
         self.running = True
 
+        backend.title("Tkinter Space Invaders")
+
+        # Canvas. It is write-only: positions live on the Entity records and
+        # every collision test runs against those, never against canvas.coords.
+        self.canvas = backend.widget("Canvas", width=WIDTH, height=HEIGHT, bg="black")
+        self.canvas.pack()
+
         # Score label
-        self.score_label = tk.Label(root, text="Score: 0", font=("Arial", 16))
+        self.score_label = backend.widget("Label", text="Score: 0", font=("Arial", 16))
         self.score_label.pack()
 
-        # Controls
-        root.bind("<Left>", lambda e: self.move_player(-20))
-        root.bind("<Right>", lambda e: self.move_player(20))
-        root.bind("<space>", lambda e: self.shoot())
-        root.bind("<Return>", lambda e: self.reset_game())
+        # Controls: queued by the backend and handled at the start of the next step
+        backend.bind("<Left>", "left")
+        backend.bind("<Right>", "right")
+        backend.bind("<space>", "fire")
+        backend.bind("<Return>", "reset")
 
         # Reset / Play Button
-        self.reset_button = tk.Button(root, text="Play / Reset", command=self.reset_game)
+        self.reset_button = backend.widget("Button", text="Play / Reset",
+                                           command=lambda: backend.inputs.push("reset"))
         self.reset_button.pack(pady=10)
 
+        self.make_pools()
+        self.player = self.spawn_player()
         self.spawn_invaders()
         self.spawn_barricades()
-        self.game_loop()
+
+    def add_entity(self, x1, y1, x2, y2, fill):
+        return Entity(x1, y1, x2, y2, self.canvas.create_rectangle(x1, y1, x2, y2, fill=fill))
+
+    def make_pools(self):
+        self.player_pool = BulletPool(self.canvas, "yellow", PLAYER_POOL_SIZE, MAX_PLAYER_BULLETS)
+        self.invader_pool = BulletPool(self.canvas, "orange", INVADER_POOL_SIZE, MAX_INVADER_BULLETS)
+
+    def report_pools(self):
+        print(self.player_pool.report())
+        print(self.invader_pool.report())
+
+    def show_score(self):
+        self.score_label.config(text=f"Score: {self.score}   Wave: {self.wave}")
+
+    def spawn_player(self):
+        return self.add_entity(290, 560, 310, 580, "white")
 
     def move_player(self, dx):
         if self.running:
-            self.canvas.move(self.player, dx, 0)
+            self.player.move(dx, 0)
+            self.canvas.move(self.player.item, dx, 0)
 
     def shoot(self):
         if self.running:
-            x1, y1, x2, y2 = self.canvas.coords(self.player)
-            bullet = self.canvas.create_rectangle((x1+x2)//2 - 2, y1 - 10, (x1+x2)//2 + 2, y1, fill="yellow")
-            self.bullets.append(bullet)
-
-    def spawn_invaders(self):
-        self.invaders.clear()
-        for row in range(3):
-            for col in range(8):
-                x = 50 + col * 60
-                y = 50 + row * 40
-                inv = self.canvas.create_rectangle(x, y, x+30, y+20, fill="red")
-                self.invaders.append(inv)
+            p = self.player
+            x = (p.x1 + p.x2) // 2
+            bullet = self.player_pool.acquire(x - 2, p.y1 - 10, x + 2, p.y1)
+            if bullet:
+                self.bullets.append(bullet)
+
+    def spawn_invaders(self, formation=None):
+        # every invader item carries the "invader" tag, so one canvas.move
+        # shifts the whole formation; the wave's own formation by default
+        f = self.formation = formation or make_wave(self.wave)
+        for row in range(f.rows):
+            for col in range(f.cols):
+                f.items[row * f.cols + col] = self.canvas.create_rectangle(
+                    f.slot_box(row, col), fill="red", tags="invader")
+        self.drawn_origin = (f.ox, f.oy)
 
     def spawn_barricades(self):
         self.barricades.clear()
         for bx in [100, 250, 400]:
-            for i in range(5):
-                block = self.canvas.create_rectangle(bx + i*10, 480, bx + i*10 + 10, 500, fill="green")
-                self.barricades.append(block)
-
-    def move_invaders(self):
-        for inv in self.invaders:
-            self.canvas.move(inv, 2, 0)
-
-            x1, y1, x2, y2 = self.canvas.coords(inv)
-            if x2 >= 600:
-                for i in self.invaders:
-                    self.canvas.move(i, -200, 20)
+            image = self.backend.image(BARRICADE_W, BARRICADE_H)
+            image.put("green", to=(0, 0, BARRICADE_W, BARRICADE_H))
+            item = self.canvas.create_image(bx, BARRICADE_Y, image=image, anchor="nw")
+            self.barricades.append(Barricade(bx, BARRICADE_Y, BARRICADE_W, BARRICADE_H, image, item))
+
+    def move_invaders(self, dt):
+        f = self.formation
+        dx = f.direction * INVADER_SPEED * dt
+        x1, y1, x2, y2 = f.bbox()
+        if x2 + dx >= WIDTH or x1 + dx <= 0:
+            # reverse and step down; no interpolation across the drop
+            f.direction = -f.direction
+            f.move(0, INVADER_DROP)
+            f.remember()
+        else:
+            f.move(dx, 0)
+
+        if f.count and random.random() < FIRE_RATE * f.cols * dt:
+            x1, y1, x2, y2 = f.slot_box(*random.choice(f.shooters()))
+            x = (x1 + x2) // 2
+            bullet = self.invader_pool.acquire(x, y2, x + 4, y2 + 10)
+            if bullet:
+                self.invader_bullets.append(bullet)
+
+    def hit_barricade(self, bullet, upward):
+        # the box test finds the barricade, the mask decides whether it is hit.
+        # There are three, in one band, so most bullets are out after one compare.
+        if bullet.y2 <= BARRICADE_Y or bullet.y1 >= BARRICADE_Y + BARRICADE_H:
+            return False
+        for barricade in self.barricades:
+            if barricade.overlaps(bullet):
                 break
+        else:
+            return False
+        spot = barricade.impact(bullet, upward)
+        if spot is None:
+            return False
+        clear = barricade.image.transparency_set
+        for x, y in barricade.carve(*spot):
+            clear(x, y, True)
+        return True
+
+    def update_bullets(self, dt):
+        # Bullets that survive the step are collected into new lists instead of
+        # being removed from the ones we're looping over. Only the model moves
+        # here; draw() puts the items where the bullets are.
 
-        if random.random() < 0.02 and self.invaders:
-            shooter = random.choice(self.invaders)
-            x1, y1, x2, y2 = self.canvas.coords(shooter)
-            bullet = self.canvas.create_rectangle((x1+x2)//2, y2, (x1+x2)//2 + 4, y2+10, fill="orange")
-            self.invader_bullets.append(bullet)
-
-    def update_bullets(self):
         # Player bullets
-        for bullet in self.bullets[:]:
-            self.canvas.move(bullet, 0, -10)
-            bx1, by1, bx2, by2 = self.canvas.coords(bullet)
-
-            if by2 < 0:
-                self.canvas.delete(bullet)
-                self.bullets.remove(bullet)
+        survivors = []
+        pool = self.player_pool
+        dy = -PLAYER_BULLET_SPEED * dt
+        for bullet in self.bullets:
+            bullet.move(0, dy)
+            if bullet.y2 < 0:
+                pool.release(bullet)
                 continue
 
             # Hit invader
-            for inv in self.invaders[:]:
-                ix1, iy1, ix2, iy2 = self.canvas.coords(inv)
-                if bx1 < ix2 and bx2 > ix1 and by1 < iy2 and by2 > iy1:
-                    self.canvas.delete(inv)
-                    self.invaders.remove(inv)
-                    self.canvas.delete(bullet)
-                    self.bullets.remove(bullet)
-                    self.score += 10
-                    self.score_label.config(text=f"Score: {self.score}")
-                    break
+            slot = self.formation.hit(bullet)
+            if slot:
+                self.formation.kill(*slot)
+                self.canvas.delete(self.formation.items[slot[0] * self.formation.cols + slot[1]])
+                pool.release(bullet)
+                self.score += 10
+                self.show_score()
+                continue
 
             # Hit barricade
-            for block in self.barricades[:]:
-                bx1b, by1b, bx2b, by2b = self.canvas.coords(block)
-                if bx1 < bx2b and bx2 > bx1b and by1 < by2b and by2 > by1b:
-                    self.canvas.delete(block)
-                    self.barricades.remove(block)
-                    self.canvas.delete(bullet)
-                    self.bullets.remove(bullet)
-                    break
+            if self.hit_barricade(bullet, upward=True):
+                pool.release(bullet)
+                continue
 
-        # Invader bullets
-        for bullet in self.invader_bullets[:]:
-            self.canvas.move(bullet, 0, 7)
-            bx1, by1, bx2, by2 = self.canvas.coords(bullet)
+            survivors.append(bullet)
+        self.bullets = survivors
 
-            if by1 > 600:
-                self.canvas.delete(bullet)
-                self.invader_bullets.remove(bullet)
+        # Invader bullets
+        survivors = []
+        pool = self.invader_pool
+        dy = INVADER_BULLET_SPEED * dt
+        for bullet in self.invader_bullets:
+            bullet.move(0, dy)
+            if bullet.y1 > HEIGHT:
+                pool.release(bullet)
                 continue
 
             # Hit player
-            px1, py1, px2, py2 = self.canvas.coords(self.player)
-            if bx1 < px2 and bx2 > px1 and by1 < py2 and by2 > py1:
-                self.running = False
-                self.canvas.create_text(300, 300, text="GAME OVER", fill="white", font=("Arial", 30))
+            if bullet.overlaps(self.player):
+                self.end_game("GAME OVER")
                 return
 
             # Hit barricade
-            for block in self.barricades[:]:
-                bx1b, by1b, bx2b, by2b = self.canvas.coords(block)
-                if bx1 < bx2b and bx2 > bx1b and by1 < by2b and by2 > by1b:
-                    self.canvas.delete(block)
-                    self.barricades.remove(block)
-                    self.canvas.delete(bullet)
-                    self.invader_bullets.remove(bullet)
-                    break
-
-    def check_game_over(self):
-        for inv in self.invaders:
-            x1, y1, x2, y2 = self.canvas.coords(inv)
-            if y2 >= 560:
-                self.running = False
-                self.canvas.create_text(300, 300, text="GAME OVER", fill="white", font=("Arial", 30))
-                return
+            if self.hit_barricade(bullet, upward=False):
+                pool.release(bullet)
+                continue
 
-        if not self.invaders:
-            self.running = False
-            self.canvas.create_text(300, 300, text="YOU WIN!", fill="white", font=("Arial", 30))
+            survivors.append(bullet)
+        self.invader_bullets = survivors
 
-    def game_loop(self):
+    def check_game_over(self):
+        if not self.formation.count:
+            # wave cleared: the next, bigger one comes in from the top
+            self.canvas.delete("invader")
+            self.wave += 1
+            self.show_score()
+            self.spawn_invaders()
+            return
+
+        if self.formation.bbox()[3] >= 560:
+            self.end_game("GAME OVER")
+
+    def end_game(self, text):
+        self.running = False
+        self.canvas.create_text(300, 300, text=text, fill="white", font=("Arial", 30))
+        if self.show_stats:
+            self.report_pools()
+
+    def handle_inputs(self):
+        for name, event in self.backend.inputs.drain():
+            if name == "left":
+                self.move_player(-20)
+            elif name == "right":
+                self.move_player(20)
+            elif name == "fire":
+                self.shoot()
+            elif name == "reset":
+                self.reset_game()
+
+    def update(self, dt):
+        # one fixed step of the simulation
+        self.handle_inputs()
+        if not self.running:
+            return
+        self.formation.remember()
+        for bullet in self.bullets:
+            bullet.remember()
+        for bullet in self.invader_bullets:
+            bullet.remember()
+        self.move_invaders(dt)
+        self.update_bullets(dt)
         if self.running:
-            self.move_invaders()
-            self.update_bullets()
             self.check_game_over()
-        self.root.after(50, self.game_loop)
 
-    def reset_game(self):
+    def draw(self, alpha):
+        # put the items where the model was `alpha` of the way through the step
+        if not self.running:
+            return
+        f = self.formation
+        x = f.px + (f.ox - f.px) * alpha
+        y = f.py + (f.oy - f.py) * alpha
+        self.canvas.move("invader", x - self.drawn_origin[0], y - self.drawn_origin[1])
+        self.drawn_origin = (x, y)
+        coords = self.canvas.coords
+        for bullet in self.bullets + self.invader_bullets:
+            y1 = bullet.py + (bullet.y1 - bullet.py) * alpha
+            coords(bullet.item, bullet.x1, y1, bullet.x2, y1 + bullet.y2 - bullet.y1)
+
+    def counts(self):
+        # (entities, canvas items) for frame telemetry; pooled bullet items
+        # exist whether or not they are in flight
+        f = self.formation
+        bullets = len(self.bullets) + len(self.invader_bullets)
+        pooled = sum(len(p.free) + p.live for p in (self.player_pool, self.invader_pool))
+        return f.count + bullets + len(self.barricades) + 1, f.count + pooled + len(self.barricades) + 1
+
+    def reset_game(self, wave=1):
         self.running = True
         self.score = 0
-        self.score_label.config(text="Score: 0")
+        self.wave = wave
+        self.show_score()
 
         self.canvas.delete("all")
 
-        self.player = self.canvas.create_rectangle(290, 560, 310, 580, fill="white")
+        self.player = self.spawn_player()
 
         self.bullets.clear()
         self.invader_bullets.clear()
-        self.invaders.clear()
+        self.make_pools()   # delete("all") took the pooled items with it
         self.barricades.clear()
 
         self.spawn_invaders()
         self.spawn_barricades()
 
-root = tk.Tk()
-game = SpaceInvaders(root)
-root.mainloop()
\ No newline at end of file
+def run_benchmark(waves=(1, 2, 4, 8, 12), seconds=1.0):
+    # Headless: the player fires every step and wanders, and the wave starts
+    # over when it ends. ticks/s counts update() calls only, no drawing.
+    rng = random.Random(0)
+    for number in waves:
+        game = SpaceInvaders(NullBackend())
+        game.reset_game(number)
+        invaders = game.formation.count
+        ticks = live = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            for _ in range(100):
+                game.shoot()
+                if rng.random() < 0.1:
+                    game.move_player(rng.choice((-20, 20)) if 40 < game.player.x1 < 540 else 0)
+                game.update(STEP)
+                live += len(game.bullets) + len(game.invader_bullets)
+                if not game.running or game.wave != number:
+                    game.reset_game(number)
+            ticks += 100
+        elapsed = time.perf_counter() - start
+        print(f"wave {number:2d}: {invaders:4d} invaders, {live / ticks:5.1f} bullets live, "
+              f"{ticks / elapsed:8,.0f} ticks/s")
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        run_benchmark()
+        sys.exit()
+    # --stats prints the bullet pools' numbers when a game ends
+    show_stats = "--stats" in sys.argv
+    run_tk(lambda backend: SpaceInvaders(backend, show_stats))
@@ -0,0 +1,496 @@
+"""Store backend: catalog, carts and checkout over HTTP, on asyncio.
+
+    python store.py [--port 8001]    # serve the API
+    python store.py --bench          # local load test
+
+The catalog is built from catalog.json (the same file build.py renders the
+page from) and kept in memory, indexed by product id and by price. Rendered
+fragments (JSON and HTML) are cached; changing a price drops exactly the
+fragments that showed it. Orders are appended to orders.wal as JSON lines.
+Checkouts that arrive while a write is in flight are written and fsynced
+together, so a burst of orders costs one fsync, and nobody is told their
+order went through before it is on disk.
+
+    GET  /api/products                  all products (JSON)
+    GET  /api/products?max_price=N      products costing at most N coid
+    GET  /api/products/<id>             one product
+    GET  /fragments/products.html       the product list as an HTML fragment
+    POST /api/carts                     new cart -> {"cart": id}
+    GET  /api/carts/<cart>
+    POST /api/carts/<cart>/items        {"product": id, "qty": n}
+    POST /api/carts/<cart>/checkout     -> {"order": n, "total": coid}
+    POST /api/prices                    {"product": id, "price": coid}
+
+/api/prices is for local tools and the load test only: it sends no CORS
+headers and refuses any request that carries an Origin header, which
+browsers add to every cross-origin POST, so a web page can't change prices.
+"""
+
+import asyncio
+import bisect
+import html
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PORT = 8001
+MAX_BODY = 1 << 16
+MAX_FRAGMENTS = 1024        # cached renders; past this, the least recently used go
+REASONS = {200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 403: "Forbidden",
+           404: "Not Found", 405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+           500: "Internal Server Error", 503: "Service Unavailable"}
+LOCAL_ONLY = {"/api/prices"}    # no CORS, and no requests from web pages
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# --- Catalog ---
+class Product:
+    __slots__ = ("id", "name", "price", "image", "section")
+
+    def __init__(self, id, name, price, image, section):
+        self.id, self.name, self.price, self.image, self.section = id, name, price, image, section
+
+    def as_dict(self):
+        return {"id": self.id, "name": self.name, "price": self.price, "image": self.image,
+                "section": self.section}
+
+class Catalog:
+    """Products by id, in page order, and a price index for range queries."""
+
+    def __init__(self, products):
+        self.order = list(products)
+        self.by_id = {p.id: p for p in self.order}
+        self.reindex()
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(Product(p["id"], p["name"], p["price"], p["image"], section["title"].rstrip(":"))
+                   for section in data["sections"] for group in section["groups"] for p in group)
+
+    def reindex(self):
+        # sorted (price, id) pairs; rebuilt on a price change, which is rare
+        self.by_price = sorted((p.price, p.id) for p in self.order)
+        self.prices = [price for price, _ in self.by_price]
+
+    def cheaper_than(self, max_price):
+        end = bisect.bisect_right(self.prices, max_price)
+        return [self.by_id[pid] for _, pid in self.by_price[:end]]
+
+    def set_price(self, pid, price):
+        self.by_id[pid].price = price
+        self.reindex()
+
+class FragmentCache:
+    """Rendered bytes by key, least recently used first, at most MAX_FRAGMENTS
+    of them. Each entry lists the products it shows; a price change drops
+    only those entries."""
+
+    def __init__(self):
+        self.entries = OrderedDict()    # key -> (body, products)
+        self.shown_in = {}              # product id -> set of keys
+        self.hits = self.misses = 0
+
+    def get(self, key, render):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[0]
+        self.misses += 1
+        body, products = render()
+        if len(self.entries) >= MAX_FRAGMENTS:
+            self.drop(next(iter(self.entries)))
+        self.entries[key] = (body, products)
+        for p in products:
+            self.shown_in.setdefault(p.id, set()).add(key)
+        return body
+
+    def drop(self, key):
+        # forget one entry, in both maps
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for p in entry[1]:
+            keys = self.shown_in.get(p.id)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self.shown_in[p.id]
+
+    def invalidate(self, pid):
+        for key in list(self.shown_in.get(pid, ())):
+            self.drop(key)
+
+def render_json(products):
+    return json.dumps([p.as_dict() for p in products]).encode(), products
+
+def render_html(products):
+    rows = [f'<li data-product="{html.escape(p.id)}">{html.escape(p.name)}: {p.price:,} coid '
+            f'<button data-product="{html.escape(p.id)}">buy</button></li>' for p in products]
+    return ("<ul>\n" + "\n".join(rows) + "\n</ul>\n").encode(), products
+
+# --- Orders ---
+class OrderLog:
+    """Append-only JSON-lines order file with group commit.
+
+    append() queues a record and waits until it is written and fsynced. A
+    single writer task takes everything queued, writes it in one go and
+    fsyncs once (in a thread, so the loop keeps serving), then releases the
+    whole batch. If the write or the fsync fails, every append in the batch
+    raises OSError and the writer carries on with the next batch.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.next_id = 1
+        good = 0        # bytes up to the end of the last complete record
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        self.next_id = json.loads(line)["order"] + 1
+                    except (ValueError, KeyError):
+                        break
+                    if not line.endswith(b"\n"):
+                        break
+                    good += len(line)
+            # drop a torn tail left by a crash mid-write
+            os.truncate(path, good)
+        self.file = open(path, "ab")
+        self.pending = []           # (bytes, future)
+        self.wakeup = asyncio.Event()
+        self.writer = None
+        self.busy = False           # a batch is being written
+        self.fsyncs = 0
+        self.written = 0
+
+    def start(self):
+        self.writer = asyncio.create_task(self.write_loop())
+
+    async def append(self, record):
+        record["order"] = self.next_id
+        self.next_id += 1
+        done = asyncio.get_running_loop().create_future()
+        self.pending.append((json.dumps(record).encode() + b"\n", done))
+        self.wakeup.set()
+        await done
+        return record["order"]
+
+    async def write_loop(self):
+        while True:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            batch, self.pending = self.pending, []
+            if not batch:
+                continue
+            self.busy = True
+            try:
+                if self.file.closed:        # a failed batch couldn't reopen it
+                    self.file = open(self.path, "ab")
+                start = self.file.tell()
+                try:
+                    self.file.write(b"".join(line for line, _ in batch))
+                    self.file.flush()
+                    await asyncio.to_thread(os.fsync, self.file.fileno())
+                except OSError:
+                    # nothing in the batch is promised: cut off what did get
+                    # out, so the file holds whole records only
+                    self.truncate(start)
+                    raise
+            except OSError as e:
+                for _, done in batch:
+                    if not done.done():
+                        done.set_exception(e)
+                continue
+            finally:
+                self.busy = False
+            self.fsyncs += 1
+            self.written += len(batch)
+            for _, done in batch:
+                if not done.done():
+                    done.set_result(None)
+
+    def truncate(self, size):
+        # best effort: reopen the file cut back to `size`; if that fails too
+        # it stays closed and the next batch tries to reopen it
+        try:
+            self.file.close()
+        except OSError:
+            pass
+        try:
+            os.truncate(self.path, size)
+            self.file = open(self.path, "ab")
+        except OSError:
+            pass
+
+    async def close(self):
+        while self.pending or self.busy:
+            await asyncio.sleep(0.001)
+        if self.writer:
+            self.writer.cancel()
+        self.file.close()
+
+# --- HTTP ---
+class Store:
+    def __init__(self, catalog, log):
+        self.catalog = catalog
+        self.log = log
+        self.cache = FragmentCache()
+        self.carts = {}
+        self.checking_out = set()   # carts whose order is being written
+        self.next_cart = 1
+        self.requests = 0
+
+    # routes: each returns (status, body bytes, content type)
+    async def handle(self, method, path, query, body):
+        parts = path.strip("/").split("/")
+        if parts[:2] == ["api", "products"]:
+            if method != "GET":
+                raise HTTPError(405, "GET only")
+            if len(parts) == 2:
+                if "max_price" in query:
+                    limit = int(query["max_price"][0])
+                    return 200, self.cache.get(("json", limit),
+                                               lambda: render_json(self.catalog.cheaper_than(limit))), "application/json"
+                return 200, self.cache.get("json", lambda: render_json(self.catalog.order)), "application/json"
+            product = self.product(parts[2])
+            return 200, self.cache.get(("json", product.id),
+                                       lambda: (json.dumps(product.as_dict()).encode(), [product])), "application/json"
+        if path == "/fragments/products.html":
+            return 200, self.cache.get("html", lambda: render_html(self.catalog.order)), "text/html; charset=utf-8"
+        if parts[:2] == ["api", "carts"] and method == "POST" and len(parts) == 2:
+            cid = str(self.next_cart)
+            self.next_cart += 1
+            self.carts[cid] = {}
+            return 201, self.json({"cart": cid}), "application/json"
+        if parts[:2] == ["api", "carts"] and len(parts) >= 3:
+            cart = self.carts.get(parts[2])
+            if cart is None:
+                raise HTTPError(404, "no such cart")
+            if len(parts) == 3 and method == "GET":
+                return 200, self.json(self.cart_view(cart)), "application/json"
+            if parts[2] in self.checking_out and method == "POST":
+                raise HTTPError(409, "cart is being checked out")
+            if parts[3:] == ["items"] and method == "POST":
+                data = self.parse(body)
+                product = self.product(data.get("product"))
+                qty = int(data.get("qty", 1))
+                cart[product.id] = max(0, cart.get(product.id, 0) + qty)
+                if not cart[product.id]:
+                    del cart[product.id]
+                return 200, self.json(self.cart_view(cart)), "application/json"
+            if parts[3:] == ["checkout"] and method == "POST":
+                if not cart:
+                    raise HTTPError(400, "cart is empty")
+                view = self.cart_view(cart)
+                # the cart goes only once its order is on disk; until then it
+                # takes no more items and no second checkout
+                self.checking_out.add(parts[2])
+                try:
+                    order = await self.log.append({"cart": parts[2], "items": view["items"],
+                                                   "total": view["total"], "time": time.time()})
+                except OSError:
+                    # not on disk, so not ordered; the cart stays for a retry
+                    raise HTTPError(503, "could not record the order, try again")
+                finally:
+                    self.checking_out.discard(parts[2])
+                del self.carts[parts[2]]
+                return 200, self.json({"order": order, "total": view["total"]}), "application/json"
+        if path == "/api/prices" and method == "POST":
+            data = self.parse(body)
+            product = self.product(data.get("product"))
+            price = data.get("price")
+            if type(price) is not int or price < 0:
+                raise HTTPError(400, "price must be a whole number of coid, 0 or more")
+            self.catalog.set_price(product.id, price)
+            self.cache.invalidate(product.id)
+            # price-filtered listings can gain or lose any product
+            for key in [k for k in self.cache.entries if isinstance(k, tuple) and isinstance(k[1], int)]:
+                self.cache.drop(key)
+            return 200, self.json(product.as_dict()), "application/json"
+        raise HTTPError(404, "not found")
+
+    def product(self, pid):
+        product = self.catalog.by_id.get(pid)
+        if product is None:
+            raise HTTPError(404, f"no product {pid!r}")
+        return product
+
+    def cart_view(self, cart):
+        items = [[pid, qty, self.catalog.by_id[pid].price] for pid, qty in cart.items()]
+        return {"items": items, "total": sum(qty * price for _, qty, price in items)}
+
+    @staticmethod
+    def parse(body):
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "body is not JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "body must be a JSON object")
+        return data
+
+    @staticmethod
+    def json(data):
+        return json.dumps(data).encode()
+
+    @staticmethod
+    def parse_head(head):
+        # request line and headers -> (method, target, version, headers, body
+        # length); ValueError when they don't parse
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, version = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        if length < 0:
+            raise ValueError("negative Content-Length")
+        return method, target, version, headers, length
+
+    async def connection(self, reader, writer):
+        # HTTP/1.1 keep-alive: requests are handled one after another per connection
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                try:
+                    method, target, version, headers, length = self.parse_head(head)
+                except ValueError as e:
+                    # the framing is lost with a head we can't read: answer and hang up
+                    self.respond(writer, 400, self.json({"error": f"bad request: {e}"}), "application/json",
+                                 close=True)
+                    break
+                if length > MAX_BODY:
+                    status, body, ctype = 413, b'{"error": "body too large"}', "application/json"
+                    self.respond(writer, status, body, ctype, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                url = urlsplit(target)
+                local_only = url.path in LOCAL_ONLY
+                self.requests += 1
+                if local_only and "origin" in headers:
+                    status, body, ctype = 403, self.json({"error": "not from a web page"}), "application/json"
+                elif method == "OPTIONS":
+                    status, body, ctype = 204, b"", "text/plain"
+                else:
+                    try:
+                        status, body, ctype = await self.handle(method, url.path, parse_qs(url.query), body)
+                    except HTTPError as e:
+                        status, body, ctype = e.status, self.json({"error": str(e)}), "application/json"
+                    except (ValueError, KeyError, TypeError) as e:
+                        status, body, ctype = 400, self.json({"error": f"bad request: {e}"}), "application/json"
+                close = headers.get("connection", "").lower() == "close" or version == "HTTP/1.0"
+                self.respond(writer, status, body, ctype, close, cors=not local_only)
+                await writer.drain()
+                if close:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def respond(writer, status, body, ctype, close=False, cors=True):
+        # the page is served from elsewhere (serve.py), so allow it to call us
+        allow = ("Access-Control-Allow-Origin: *\r\n"
+                 "Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+                 "Access-Control-Allow-Headers: Content-Type\r\n") if cors else ""
+        writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                     f"Content-Type: {ctype}\r\nContent-Length: {len(body)}\r\n{allow}"
+                     f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n".encode() + body)
+
+async def start_store(port, log_path):
+    store = Store(Catalog.load(os.path.join(HERE, "catalog.json")), OrderLog(log_path))
+    store.log.start()
+    server = await asyncio.start_server(store.connection, "127.0.0.1", port)
+    return store, server
+
+async def serve(port, log_path):
+    store, server = await start_store(port, log_path)
+    print(f"store on http://127.0.0.1:{port}/api/products, orders in {log_path}")
+    async with server:
+        await server.serve_forever()
+
+# --- Load test ---
+async def bench_client(port, seconds, latencies, rng):
+    # one keep-alive connection: browse, fill a cart, check out now and then
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+    async def call(method, path, data=None):
+        body = json.dumps(data).encode() if data is not None else b""
+        t = time.perf_counter()
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+        payload = await reader.readexactly(length)
+        latencies.append(time.perf_counter() - t)
+        return json.loads(payload) if path.startswith("/api") else payload
+
+    ids = [p["id"] for p in await call("GET", "/api/products")]
+    cart = (await call("POST", "/api/carts"))["cart"]
+    stop = time.perf_counter() + seconds
+    while time.perf_counter() < stop:
+        roll = rng.random()
+        if roll < 0.5:
+            await call("GET", "/fragments/products.html")
+        elif roll < 0.8:
+            await call("GET", f"/api/products/{rng.choice(ids)}")
+        elif roll < 0.95:
+            await call("POST", f"/api/carts/{cart}/items", {"product": rng.choice(ids), "qty": 1})
+        else:
+            await call("POST", f"/api/carts/{cart}/items", {"product": rng.choice(ids), "qty": 1})
+            await call("POST", f"/api/carts/{cart}/checkout")
+            cart = (await call("POST", "/api/carts"))["cart"]
+    writer.close()
+
+async def run_benchmark(clients=32, seconds=3.0):
+    import random
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        store, server = await start_store(0, os.path.join(tmp, "orders.wal"))
+        port = server.sockets[0].getsockname()[1]
+        latencies = []
+        rng = random.Random(0)
+        start = time.perf_counter()
+        clients_done = asyncio.gather(*(bench_client(port, seconds, latencies, random.Random(rng.random()))
+                                        for _ in range(clients)))
+        # a price change every half second, to keep the fragment cache honest
+        while not clients_done.done():
+            await asyncio.sleep(0.5)
+            product = rng.choice(store.catalog.order)
+            await store.handle("POST", "/api/prices", {}, json.dumps(
+                {"product": product.id, "price": product.price + 1}).encode())
+        await clients_done
+        elapsed = time.perf_counter() - start
+        server.close()
+        await store.log.close()
+        latencies.sort()
+        log = store.log
+        print(f"{clients} clients, {elapsed:.1f}s, client and server sharing one process")
+        print(f"{len(latencies) / elapsed:,.0f} req/s, p50 {latencies[len(latencies) // 2] * 1000:.2f} ms, "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+        print(f"{log.written} orders in {log.fsyncs} fsyncs ({log.written / max(1, log.fsyncs):.1f} per fsync), "
+              f"fragment cache {store.cache.hits} hits / {store.cache.misses} misses")
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        asyncio.run(run_benchmark())
+        sys.exit()
+    port = int(sys.argv[sys.argv.index("--port") + 1]) if "--port" in sys.argv else PORT
+    try:
+        asyncio.run(serve(port, os.path.join(HERE, "orders.wal")))
+    except KeyboardInterrupt:
+        pass